@@ -0,0 +1,98 @@
+import io
+import time
+import discord
+from discord import app_commands
+from discord.ext import commands
+import profiling
+from shards import SHARD_HEALTH_KEY, format_shard_health, process_label, shard_health
+from slash_commands import load_bot_states_async
+from ui import ReportPaginatorView
+
+
+PROFILE_MAX_SECONDS = 300
+
+
+class AdminCommands(commands.Cog):
+    """Operator tools, restricted to the bot's owner(s)."""
+
+    # Needs nothing beyond what the gateway always sends
+    REQUIRED_INTENTS = ()
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if await self.bot.is_owner(interaction.user):
+            return True
+        await interaction.response.send_message(
+            "Only the bot owner can use this command.",
+            ephemeral=True
+        )
+        return False
+
+    @app_commands.command(
+        name="profile",
+        description="Profile the bot for a while and get the report as a file (owner only)"
+    )
+    @app_commands.describe(
+        mode="sampling is cheap, cprofile is exact but slows the bot, tracemalloc shows memory",
+        seconds="How long to profile for",
+        top="How many entries to list per section"
+    )
+    @app_commands.choices(mode=[
+        app_commands.Choice(name="sampling", value="sampling"),
+        app_commands.Choice(name="cprofile", value="cprofile"),
+        app_commands.Choice(name="tracemalloc", value="tracemalloc"),
+    ])
+    @app_commands.default_permissions(administrator=True)
+    async def profile(self,
+                      interaction: discord.Interaction,
+                      mode: app_commands.Choice[str],
+                      seconds: app_commands.Range[int, 1, PROFILE_MAX_SECONDS] = 30,
+                      top: app_commands.Range[int, 5, 200] = 40
+    ):
+        if profiling.is_running():
+            await interaction.response.send_message("❌ A profile is already running.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        print(f"{interaction.user.display_name} started a {mode.value} profile for {seconds}s")
+
+        runners = {
+            "sampling": profiling.profile_sampling,
+            "cprofile": profiling.profile_cprofile,
+            "tracemalloc": profiling.profile_tracemalloc,
+        }
+        try:
+            report = await runners[mode.value](seconds, top)
+        except Exception as e:
+            await interaction.followup.send(f"❌ Profiling failed: {e}", ephemeral=True)
+            return
+
+        data = io.BytesIO(report.encode("utf-8"))
+        filename = f"profile_{mode.value}_{time.strftime('%Y%m%d_%H%M%S')}.txt"
+        await interaction.followup.send(
+            f"✅ {mode.name} profile over {seconds}s.",
+            file=discord.File(data, filename=filename),
+            ephemeral=True
+        )
+
+    @app_commands.command(
+        name="shard_status",
+        description="Shows gateway latency and shard health for every bot process (owner only)"
+    )
+    @app_commands.default_permissions(administrator=True)
+    async def shard_status(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True)
+
+        # Other processes report through the shared store; ours is read live
+        label = process_label()
+        reports = await load_bot_states_async(f"{SHARD_HEALTH_KEY}.")
+        reports = {r["label"]: r for r in reports.values() if r.get("label") != label}
+        reports[label] = shard_health(self.bot, label)
+
+        lines = []
+        for name in sorted(reports):
+            lines.extend(format_shard_health(reports[name]).split("\n"))
+        view = ReportPaginatorView(invoker=interaction.user, title="Shard status", lines=lines)
+        await interaction.followup.send(embed=view.render(), view=view, ephemeral=True)
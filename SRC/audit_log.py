@@ -0,0 +1,162 @@
+import os
+import asyncio
+import discord
+from metrics import Counter, Gauge
+
+
+# Seconds the sink waits to collect more embeds before sending a batch
+AUDIT_FLUSH_INTERVAL = float(os.environ.get("AUDIT_FLUSH_INTERVAL", "2"))
+# Queued embeds before send() starts waiting for the sink to catch up
+AUDIT_QUEUE_SIZE = int(os.environ.get("AUDIT_QUEUE_SIZE", "500"))
+# Post through a channel webhook (own rate limit bucket) instead of as the bot
+AUDIT_USE_WEBHOOKS = os.environ.get("AUDIT_USE_WEBHOOKS", "false").lower() == "true"
+AUDIT_WEBHOOK_NAME = "VCControl audit log"
+
+# Discord's per-message limits
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+
+AUDIT_MESSAGES = Counter("audit_log_messages_total", "Audit log messages sent by transport and outcome")
+AUDIT_EMBEDS = Counter("audit_log_embeds_total", "Audit log embeds delivered")
+
+
+class AuditLogSink:
+    """Queues log embeds and posts them in batches.
+
+    Embeds queued within AUDIT_FLUSH_INTERVAL of each other go out together,
+    up to 10 per message, so an onboarding rush costs a handful of messages
+    instead of one per action. The queue is bounded: when the sink falls
+    behind, send() waits instead of piling up embeds in memory. close()
+    delivers whatever is still queued.
+    """
+
+    def __init__(self, bot, interval: float = AUDIT_FLUSH_INTERVAL, max_queue: int = AUDIT_QUEUE_SIZE,
+                 use_webhooks: bool = AUDIT_USE_WEBHOOKS):
+        self.bot = bot
+        self.interval = interval
+        self.use_webhooks = use_webhooks
+        # (channel id, embed, file or None); None tells the sink to stop
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, max_queue))
+        self._task: asyncio.Task | None = None
+        self._closed = False
+        # channel id -> webhook, or None when the bot can't manage webhooks there
+        self._webhooks: dict[int, discord.Webhook | None] = {}
+        Gauge("audit_log_queue_depth", "Audit log embeds waiting to be sent", collect=self._queue.qsize)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._closed = False
+            self._task = asyncio.create_task(self._run(), name="audit-log-sink")
+
+    async def send(self, channel: discord.abc.Messageable, embed: discord.Embed, file: discord.File | None = None):
+        """Queue an embed for `channel`; waits while the queue is full."""
+        if self._closed or self._task is None or self._task.done():
+            # Not running (or shutting down): deliver directly rather than drop it
+            await self._deliver(channel.id, [(embed, file)])
+            return
+        await self._queue.put((channel.id, embed, file))
+
+    async def close(self):
+        """Stop the sink after delivering everything still queued."""
+        if self._closed or self._task is None:
+            return
+        self._closed = True
+        if self._task.done():
+            # The sink stopped early; send what it left behind directly
+            items = []
+            while not self._queue.empty():
+                items.append(self._queue.get_nowait())
+            await self._flush([item for item in items if item is not None])
+        else:
+            await self._queue.put(None)
+            try:
+                await self._task
+            except Exception as e:
+                print("Audit log sink failed while flushing:", e)
+        self._task = None
+
+    async def _run(self):
+        stopping = False
+        while not stopping:
+            items = [await self._queue.get()]
+            if items[0] is not None:
+                # Give the rest of a burst a moment to arrive
+                await asyncio.sleep(self.interval)
+            while not self._queue.empty():
+                items.append(self._queue.get_nowait())
+            stopping = None in items
+            try:
+                await self._flush([item for item in items if item is not None])
+            except Exception as e:
+                # Keep the sink alive; one bad batch shouldn't stop the audit log
+                print(f"Failed to flush {len(items)} audit log item(s):", e)
+
+    async def _flush(self, items: list[tuple]):
+        if not items:
+            return
+        by_channel: dict[int, list[tuple]] = {}
+        for channel_id, embed, file in items:
+            by_channel.setdefault(channel_id, []).append((embed, file))
+        results = await asyncio.gather(
+            *(self._deliver(cid, entries) for cid, entries in by_channel.items()),
+            return_exceptions=True
+        )
+        for channel_id, result in zip(by_channel, results):
+            if isinstance(result, Exception):
+                print(f"Failed to deliver audit log embeds to channel {channel_id}: {result}")
+
+    @staticmethod
+    def _batches(entries: list[tuple]):
+        batch, chars = [], 0
+        for embed, file in entries:
+            size = len(embed)
+            if batch and (len(batch) >= MAX_EMBEDS_PER_MESSAGE or chars + size > MAX_EMBED_CHARS_PER_MESSAGE):
+                yield batch
+                batch, chars = [], 0
+            batch.append((embed, file))
+            chars += size
+        if batch:
+            yield batch
+
+    async def _deliver(self, channel_id: int, entries: list[tuple]):
+        channel = self.bot.get_channel(channel_id)
+        if channel is None:
+            print(f"Audit log channel {channel_id} not found, dropping {len(entries)} embed(s)")
+            return
+        webhook = await self._webhook(channel) if self.use_webhooks else None
+        # Batches for one channel go out in order
+        for batch in self._batches(entries):
+            embeds = [embed for embed, _ in batch]
+            files = [file for _, file in batch if file is not None]
+            transport = "webhook" if webhook else "channel"
+            try:
+                if webhook:
+                    await webhook.send(embeds=embeds, files=files)
+                else:
+                    await channel.send(embeds=embeds, files=files)
+                AUDIT_MESSAGES.inc(transport=transport, status="ok")
+                AUDIT_EMBEDS.inc(len(embeds))
+            except Exception as e:
+                # HTTP errors as well as connection drops and timeouts
+                AUDIT_MESSAGES.inc(transport=transport, status="error")
+                print(f"Failed to send {len(embeds)} audit log embed(s) to {channel}: {e}")
+
+    async def _webhook(self, channel) -> discord.Webhook | None:
+        if channel.id in self._webhooks:
+            return self._webhooks[channel.id]
+        webhook = None
+        try:
+            for existing in await channel.webhooks():
+                if existing.name == AUDIT_WEBHOOK_NAME and existing.user == self.bot.user:
+                    webhook = existing
+                    break
+            if webhook is None:
+                webhook = await channel.create_webhook(name=AUDIT_WEBHOOK_NAME, reason="Batched audit log delivery")
+        except (discord.Forbidden, AttributeError):
+            # Missing Manage Webhooks, or not a channel that has webhooks
+            print(f"Can't use a webhook in {channel}, posting audit logs as the bot")
+        except discord.HTTPException as e:
+            print(f"Failed to set up audit log webhook in {channel}: {e}")
+            return None
+        self._webhooks[channel.id] = webhook
+        return webhook
@@ -0,0 +1,71 @@
+import os
+import time
+import random
+import asyncio
+import discord
+
+
+BULK_CONCURRENCY = int(os.environ.get("BULK_CONCURRENCY", "5"))
+BULK_RETRIES = int(os.environ.get("BULK_RETRIES", "2"))
+BULK_BACKOFF = float(os.environ.get("BULK_BACKOFF", "1.0"))  # seconds, doubled per retry
+
+
+class BulkResult:
+    """Outcome of a run_bulk() call."""
+
+    def __init__(self):
+        self.succeeded = 0
+        self.failed = 0
+        self.retried = 0
+        self.elapsed = 0.0
+        # (item, exception) for every item that ultimately failed
+        self.errors: list[tuple[object, Exception]] = []
+
+    def summary(self) -> str:
+        return (
+            f"{self.succeeded} succeeded, {self.failed} failed, "
+            f"{self.retried} retried in {self.elapsed:.1f}s"
+        )
+
+
+def is_retryable(error: Exception) -> bool:
+    """Rate limits, 5xx responses and timeouts are worth another attempt."""
+    if isinstance(error, (discord.Forbidden, discord.NotFound)):
+        return False
+    if isinstance(error, discord.HTTPException):
+        return error.status == 429 or error.status >= 500
+    return isinstance(error, (asyncio.TimeoutError, OSError))
+
+
+async def run_bulk(items, action, concurrency: int = BULK_CONCURRENCY,
+                   retries: int = BULK_RETRIES, backoff: float = BULK_BACKOFF) -> BulkResult:
+    """Await `action(item)` for every item, at most `concurrency` at a time.
+
+    discord.py already waits out per-route rate-limit buckets; the concurrency
+    limit keeps us from piling hundreds of requests into the same bucket.
+    Retryable failures are retried with exponential backoff and jitter.
+    """
+    result = BulkResult()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    start = time.perf_counter()
+
+    async def worker(item):
+        attempt = 0
+        while True:
+            try:
+                async with semaphore:
+                    await action(item)
+                result.succeeded += 1
+                return
+            except Exception as e:
+                if attempt >= retries or not is_retryable(e):
+                    result.failed += 1
+                    result.errors.append((item, e))
+                    return
+                attempt += 1
+                result.retried += 1
+                await asyncio.sleep(backoff * (2 ** (attempt - 1)) * (1 + random.random() / 2))
+
+    await asyncio.gather(*(worker(item) for item in items))
+    result.elapsed = time.perf_counter() - start
+    return result
@@ -1,20 +1,98 @@
 import os
 import json
+import time
+import asyncio
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 import psycopg2
-from psycopg2.extras import Json, register_default_jsonb
+from psycopg2 import pool as pg_pool
+from psycopg2.extras import Json, execute_values, register_default_jsonb
+from metrics import Histogram
 
 register_default_jsonb()
 
 DATABASE_URL = os.environ.get("DATABASE_URL")
 
+POOL_MIN = int(os.environ.get("DB_POOL_MIN", "1"))
+POOL_MAX = int(os.environ.get("DB_POOL_MAX", "5"))
+CONNECT_TIMEOUT = int(os.environ.get("DB_CONNECT_TIMEOUT", "5"))  # seconds
+STATEMENT_TIMEOUT = int(os.environ.get("DB_STATEMENT_TIMEOUT_MS", "5000"))  # milliseconds
+POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "10"))  # seconds to wait for a free connection
+
+CONNECT_TIME = Histogram("db_connect_seconds", "Time to open a new Postgres connection")
+QUERY_TIME = Histogram("db_query_seconds", "Time spent in a DB operation, including pool wait")
+
+
+class _TimedPool(pg_pool.ThreadedConnectionPool):
+    """Connection pool that records how long opening a connection takes."""
+
+    def _connect(self, key=None):
+        start = time.perf_counter()
+        try:
+            return super()._connect(key)
+        finally:
+            CONNECT_TIME.observe(time.perf_counter() - start)
 
-def _get_conn():
-    if not DATABASE_URL:
-        raise RuntimeError("DATABASE_URL not configured")
-    # Ensure SSL for services like Railway when not specified in the URL
-    if "sslmode=" in (DATABASE_URL or ""):
-        return psycopg2.connect(DATABASE_URL)
-    return psycopg2.connect(DATABASE_URL, sslmode="require")
+
+_pool = None
+_pool_lock = threading.Lock()
+# ThreadedConnectionPool raises instead of waiting when exhausted, so gate
+# checkouts with a semaphore to make callers queue for a free connection.
+_pool_slots = threading.BoundedSemaphore(POOL_MAX)
+# Runs the blocking DB calls for the *_async functions off the event loop.
+_executor = ThreadPoolExecutor(max_workers=POOL_MAX, thread_name_prefix="db")
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                if not DATABASE_URL:
+                    raise RuntimeError("DATABASE_URL not configured")
+                kwargs = {
+                    "connect_timeout": CONNECT_TIMEOUT,
+                    "options": f"-c statement_timeout={STATEMENT_TIMEOUT}",
+                }
+                # Ensure SSL for services like Railway when not specified in the URL
+                if "sslmode=" not in DATABASE_URL:
+                    kwargs["sslmode"] = "require"
+                _pool = _TimedPool(POOL_MIN, POOL_MAX, DATABASE_URL, **kwargs)
+    return _pool
+
+
+@contextmanager
+def _get_conn(op: str = "query"):
+    """Check a connection out of the pool for the duration of the block."""
+    start = time.perf_counter()
+    if not _pool_slots.acquire(timeout=POOL_TIMEOUT):
+        QUERY_TIME.observe(time.perf_counter() - start, op=op)
+        raise RuntimeError(f"No free DB connection after {POOL_TIMEOUT:.0f}s ({op}); all {POOL_MAX} are in use")
+    try:
+        pool = _get_pool()
+        conn = pool.getconn()
+        try:
+            yield conn
+        finally:
+            # Broken connections are dropped instead of being handed out again
+            pool.putconn(conn, close=bool(conn.closed))
+    finally:
+        _pool_slots.release()
+        QUERY_TIME.observe(time.perf_counter() - start, op=op)
+
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+
+async def _run(fn, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, fn, *args)
 
 
 def ensure_table():
@@ -28,11 +106,38 @@ def ensure_table():
         "updated_at TIMESTAMPTZ"
         ")"
     )
+    create_raids_sql = (
+        "CREATE TABLE IF NOT EXISTS raid_states ("
+        "guild_id TEXT PRIMARY KEY,"
+        "data JSONB NOT NULL,"
+        "updated_at TIMESTAMPTZ"
+        ")"
+    )
+    create_forum_links_sql = (
+        "CREATE TABLE IF NOT EXISTS forum_links ("
+        "guild_id TEXT PRIMARY KEY,"
+        "data JSONB NOT NULL,"
+        "updated_at TIMESTAMPTZ"
+        ")"
+    )
+    create_thread_jobs_sql = (
+        "CREATE TABLE IF NOT EXISTS thread_jobs ("
+        "guild_id TEXT PRIMARY KEY,"
+        "data JSONB NOT NULL,"
+        "updated_at TIMESTAMPTZ"
+        ")"
+    )
+    create_bot_state_sql = (
+        "CREATE TABLE IF NOT EXISTS bot_state ("
+        "key TEXT PRIMARY KEY,"
+        "data JSONB NOT NULL,"
+        "updated_at TIMESTAMPTZ"
+        ")"
+    )
     alter_name = "ALTER TABLE guild_configs ADD COLUMN IF NOT EXISTS name TEXT"
     alter_updated = "ALTER TABLE guild_configs ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ"
 
-    conn = _get_conn()
-    try:
+    with _get_conn("ensure_table") as conn:
         with conn:
             with conn.cursor() as cur:
                 try:
@@ -46,16 +151,20 @@ def ensure_table():
                 except Exception:
                     # Ignore - we'll still attempt other operations and let callers handle errors
                     pass
-    finally:
-        conn.close()
+                try:
+                    cur.execute(create_raids_sql)
+                    cur.execute(create_forum_links_sql)
+                    cur.execute(create_thread_jobs_sql)
+                    cur.execute(create_bot_state_sql)
+                except Exception:
+                    pass
 
 
 def load_all_configs() -> dict:
     """Return mapping guild_id -> config (dict) from DB."""
     if not DATABASE_URL:
         return {}
-    conn = _get_conn()
-    try:
+    with _get_conn("load_all_configs") as conn:
         with conn.cursor() as cur:
             cur.execute("SELECT guild_id, data FROM guild_configs")
             rows = cur.fetchall()
@@ -70,15 +179,12 @@ def load_all_configs() -> dict:
                         pass
                 result[gid] = data
             return result
-    finally:
-        conn.close()
 
 
 def load_guild_config(guild_id: str):
     if not DATABASE_URL:
         return None
-    conn = _get_conn()
-    try:
+    with _get_conn("load_guild_config") as conn:
         with conn.cursor() as cur:
             cur.execute("SELECT data FROM guild_configs WHERE guild_id = %s", (str(guild_id),))
             row = cur.fetchone()
@@ -91,15 +197,12 @@ def load_guild_config(guild_id: str):
                 except Exception:
                     return data
             return data
-    finally:
-        conn.close()
 
 
 def save_guild_config(guild_id: str, cfg: dict):
     if not DATABASE_URL:
         return
-    conn = _get_conn()
-    try:
+    with _get_conn("save_guild_config") as conn:
         with conn:
             with conn.cursor() as cur:
                 # Try upsert including name and updated_at (works if those columns exist)
@@ -126,43 +229,225 @@ def save_guild_config(guild_id: str, cfg: dict):
                         "ON CONFLICT (guild_id) DO UPDATE SET data = EXCLUDED.data",
                         (str(guild_id), json.dumps(cfg)),
                     )
-    finally:
-        conn.close()
 
 
-def save_config(config: dict):
+def save_config(config: dict) -> dict:
+    """Upsert every guild config in a single round trip.
+
+    Returns {"rows": rows written, "elapsed": seconds}.
+    """
+    if not DATABASE_URL or not config:
+        return {"rows": 0, "elapsed": 0.0}
+
+    start = time.perf_counter()
+    # Key by the stringified id so one statement never touches a row twice
+    configs = {str(guild_id): cfg for guild_id, cfg in config.items()}
+    rows = [
+        (guild_id, cfg.get("name") if isinstance(cfg, dict) else None, Json(cfg))
+        for guild_id, cfg in configs.items()
+    ]
+
+    with _get_conn("save_config") as conn:
+        with conn:
+            with conn.cursor() as cur:
+                try:
+                    execute_values(
+                        cur,
+                        "INSERT INTO guild_configs (guild_id, name, data, updated_at) VALUES %s "
+                        "ON CONFLICT (guild_id) DO UPDATE SET data = EXCLUDED.data, name = EXCLUDED.name, updated_at = now()",
+                        rows,
+                        template="(%s, %s, %s, now())",
+                        page_size=len(rows),
+                    )
+                except psycopg2.Error:
+                    # Older tables without name/updated_at: retry without them
+                    conn.rollback()
+                    execute_values(
+                        cur,
+                        "INSERT INTO guild_configs (guild_id, data) VALUES %s "
+                        "ON CONFLICT (guild_id) DO UPDATE SET data = EXCLUDED.data",
+                        [(guild_id, data) for guild_id, _, data in rows],
+                        page_size=len(rows),
+                    )
+                written = cur.rowcount
+
+    elapsed = time.perf_counter() - start
+    print(f"DB save_config: upserted {written} guild config(s) in {elapsed * 1000:.1f} ms")
+    return {"rows": written, "elapsed": elapsed}
+
+
+def load_all_raids() -> dict:
+    """Return mapping guild_id -> raid state for every running raid."""
+    if not DATABASE_URL:
+        return {}
+    with _get_conn("load_all_raids") as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT guild_id, data FROM raid_states")
+            return {gid: data for gid, data in cur.fetchall()}
+
+
+def save_raid(guild_id: str, raid: dict):
     if not DATABASE_URL:
         return
-    conn = _get_conn()
-    try:
+    with _get_conn("save_raid") as conn:
         with conn:
             with conn.cursor() as cur:
-                for guild_id, cfg in config.items():
-                    try:
-                        cur.execute(
-                            "INSERT INTO guild_configs (guild_id, name, data, updated_at) VALUES (%s, %s, %s, now()) "
-                            "ON CONFLICT (guild_id) DO UPDATE SET data = EXCLUDED.data, name = EXCLUDED.name, updated_at = now()",
-                            (str(guild_id), cfg.get("name"), Json(cfg)),
-                        )
-                        continue
-                    except Exception:
-                        pass
+                cur.execute(
+                    "INSERT INTO raid_states (guild_id, data, updated_at) VALUES (%s, %s, now()) "
+                    "ON CONFLICT (guild_id) DO UPDATE SET data = EXCLUDED.data, updated_at = now()",
+                    (str(guild_id), Json(raid)),
+                )
 
-                    try:
-                        cur.execute(
-                            "INSERT INTO guild_configs (guild_id, data) VALUES (%s, %s) "
-                            "ON CONFLICT (guild_id) DO UPDATE SET data = EXCLUDED.data",
-                            (str(guild_id), Json(cfg)),
-                        )
-                    except Exception:
-                        cur.execute(
-                            "INSERT INTO guild_configs (guild_id, data) VALUES (%s, %s) "
-                            "ON CONFLICT (guild_id) DO UPDATE SET data = EXCLUDED.data",
-                            (str(guild_id), json.dumps(cfg)),
-                        )
-    finally:
-        conn.close()
+
+def delete_raid(guild_id: str):
+    if not DATABASE_URL:
+        return
+    with _get_conn("delete_raid") as conn:
+        with conn:
+            with conn.cursor() as cur:
+                cur.execute("DELETE FROM raid_states WHERE guild_id = %s", (str(guild_id),))
+
+
+def load_forum_links(guild_id: str):
+    if not DATABASE_URL:
+        return None
+    with _get_conn("load_forum_links") as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT data FROM forum_links WHERE guild_id = %s", (str(guild_id),))
+            row = cur.fetchone()
+            return row[0] if row else None
+
+
+def save_forum_links(guild_id: str, links: dict):
+    if not DATABASE_URL:
+        return
+    with _get_conn("save_forum_links") as conn:
+        with conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "INSERT INTO forum_links (guild_id, data, updated_at) VALUES (%s, %s, now()) "
+                    "ON CONFLICT (guild_id) DO UPDATE SET data = EXCLUDED.data, updated_at = now()",
+                    (str(guild_id), Json(links)),
+                )
+
+
+def load_all_thread_jobs() -> dict:
+    """Return mapping guild_id -> {job id: job} for unfinished thread jobs."""
+    if not DATABASE_URL:
+        return {}
+    with _get_conn("load_all_thread_jobs") as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT guild_id, data FROM thread_jobs")
+            return {gid: data for gid, data in cur.fetchall() if data}
+
+
+def save_thread_jobs(guild_id: str, jobs: dict):
+    if not DATABASE_URL:
+        return
+    with _get_conn("save_thread_jobs") as conn:
+        with conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "INSERT INTO thread_jobs (guild_id, data, updated_at) VALUES (%s, %s, now()) "
+                    "ON CONFLICT (guild_id) DO UPDATE SET data = EXCLUDED.data, updated_at = now()",
+                    (str(guild_id), Json(jobs)),
+                )
+
+
+def load_bot_state(key: str):
+    """Return the bot-wide state stored under `key` (e.g. command tree hashes)."""
+    if not DATABASE_URL:
+        return None
+    with _get_conn("load_bot_state") as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT data FROM bot_state WHERE key = %s", (key,))
+            row = cur.fetchone()
+            return row[0] if row else None
+
+
+def load_bot_states(prefix: str) -> dict:
+    """Return mapping key -> data for every bot state key starting with `prefix`."""
+    if not DATABASE_URL:
+        return {}
+    with _get_conn("load_bot_states") as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT key, data FROM bot_state WHERE left(key, length(%s)) = %s", (prefix, prefix))
+            return {key: data for key, data in cur.fetchall()}
+
+
+def save_bot_state(key: str, data: dict):
+    if not DATABASE_URL:
+        return
+    with _get_conn("save_bot_state") as conn:
+        with conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "INSERT INTO bot_state (key, data, updated_at) VALUES (%s, %s, now()) "
+                    "ON CONFLICT (key) DO UPDATE SET data = EXCLUDED.data, updated_at = now()",
+                    (key, Json(data)),
+                )
+
+
+# Awaitable variants for use from coroutines; they run on the DB executor so
+# a slow query never blocks the gateway connection.
+async def ensure_table_async():
+    return await _run(ensure_table)
+
+
+async def load_all_configs_async() -> dict:
+    return await _run(load_all_configs)
+
+
+async def load_guild_config_async(guild_id: str):
+    return await _run(load_guild_config, guild_id)
+
+
+async def save_guild_config_async(guild_id: str, cfg: dict):
+    return await _run(save_guild_config, guild_id, cfg)
+
+
+async def save_config_async(config: dict) -> dict:
+    return await _run(save_config, config)
+
+
+
+async def load_all_raids_async() -> dict:
+    return await _run(load_all_raids)
+
+
+async def save_raid_async(guild_id: str, raid: dict):
+    return await _run(save_raid, guild_id, raid)
+
+
+async def delete_raid_async(guild_id: str):
+    return await _run(delete_raid, guild_id)
+
+
+
+async def load_forum_links_async(guild_id: str):
+    return await _run(load_forum_links, guild_id)
+
+
+async def save_forum_links_async(guild_id: str, links: dict):
+    return await _run(save_forum_links, guild_id, links)
+
+
+
+async def load_all_thread_jobs_async() -> dict:
+    return await _run(load_all_thread_jobs)
+
+
+async def save_thread_jobs_async(guild_id: str, jobs: dict):
+    return await _run(save_thread_jobs, guild_id, jobs)
+
+
+async def load_bot_state_async(key: str):
+    return await _run(load_bot_state, key)
+
+
+async def load_bot_states_async(prefix: str) -> dict:
+    return await _run(load_bot_states, prefix)
 
 
-# Ensure the table exists when module is imported (if DATABASE_URL present)
-ensure_table()
+async def save_bot_state_async(key: str, data: dict):
+    return await _run(save_bot_state, key, data)
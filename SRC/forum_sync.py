@@ -0,0 +1,354 @@
+import os
+import re
+import time
+import asyncio
+import discord
+from bulk import run_bulk
+
+
+SYNC_WORKERS = int(os.environ.get("FORUM_SYNC_WORKERS", "4"))
+
+
+def sanitize_name(name: str) -> str:
+    return re.sub(r"[^\w\s-]", "", name)[:90]
+
+
+class GuildNameIndex:
+    """Name -> role / voice channel lookups for a guild's forum posts.
+
+    Built once from the guild cache so per-thread lookups are dict hits instead
+    of linear scans over guild.roles and guild.voice_channels. Keeps the first
+    match for a name, like discord.utils.get. The cog keeps one per guild,
+    shared by the forum commands and listeners so they use the same per-name
+    locks, and keeps it current from the role and channel events.
+    """
+
+    def __init__(self, guild: discord.Guild):
+        self._guild = guild
+        self.roles: dict[str, discord.Role] = {}
+        for role in guild.roles:
+            self.roles.setdefault(role.name, role)
+
+        self.voice_channels: dict[str, discord.VoiceChannel] = {}
+        # (category id, name) -> channel
+        self.category_voice_channels: dict[tuple[int | None, str], discord.VoiceChannel] = {}
+        for channel in guild.voice_channels:
+            self.add_voice_channel(channel)
+
+        # name -> lock, so concurrent workers don't create the same role/VC twice
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def lock(self, name: str) -> asyncio.Lock:
+        return self._locks.setdefault(name, asyncio.Lock())
+
+    def role(self, name: str) -> discord.Role | None:
+        return self.roles.get(name)
+
+    def voice_channel(self, name: str, category: discord.CategoryChannel | None = None) -> discord.VoiceChannel | None:
+        if category is None:
+            return self.voice_channels.get(name)
+        return self.category_voice_channels.get((category.id, name))
+
+    def add_role(self, role: discord.Role):
+        self.roles.setdefault(role.name, role)
+
+    def add_voice_channel(self, channel: discord.VoiceChannel):
+        self.voice_channels.setdefault(channel.name, channel)
+        self.category_voice_channels.setdefault((channel.category_id, channel.name), channel)
+
+    def remove_role(self, role: discord.Role):
+        if self.roles.get(role.name) == role:
+            del self.roles[role.name]
+            # Fall back to another role with the same name, if any
+            for other in self._guild.roles:
+                if other.name == role.name and other != role:
+                    self.add_role(other)
+                    break
+
+    def remove_voice_channel(self, channel: discord.VoiceChannel):
+        if self.voice_channels.get(channel.name) == channel:
+            del self.voice_channels[channel.name]
+        key = (channel.category_id, channel.name)
+        if self.category_voice_channels.get(key) == channel:
+            del self.category_voice_channels[key]
+        for other in self._guild.voice_channels:
+            if other.name == channel.name and other != channel:
+                self.add_voice_channel(other)
+
+
+async def ensure_vc_for_thread(guild, thread, category, index: GuildNameIndex | None = None):
+    title = sanitize_name(thread.name)
+    if index is None:
+        index = GuildNameIndex(guild)
+
+    async with index.lock(title):
+        _, _, created = await _ensure_vc(guild, title, category, index)
+    return created
+
+
+async def _ensure_vc(guild, title, category, index):
+    """Find or create the role and VC for `title`. Returns (role, vc, created)."""
+    # Get or create role
+    role = index.role(title)
+    if role is None:
+        role = await guild.create_role(name=title)
+        index.add_role(role)
+
+    # Check if VC already exists in the category
+    channel = index.voice_channel(title, category)
+    if channel:
+        return role, channel, False
+
+    overwrites = {
+        guild.default_role: discord.PermissionOverwrite(view_channel=False),
+        role: discord.PermissionOverwrite(view_channel=True, connect=True, speak=True)
+    }
+
+    channel = await guild.create_voice_channel(
+        name=title,
+        category=category,
+        overwrites=overwrites
+    )
+    index.add_voice_channel(channel)
+    return role, channel, True
+
+
+class ForumLinks:
+    """Stored mapping of forum posts to the role and VC created for them.
+
+    Per guild the data looks like
+    {"forums": {forum id: {"category": id}},
+     "threads": {thread id: {"forum": id, "name": str, "role": id, "vc": id}}}
+    (ids used as keys are strings so the data round-trips through JSON).
+    `load` and `save` are the async storage callables to use.
+    """
+
+    def __init__(self, load, save):
+        self._load = load
+        self._save = save
+        self._links: dict[int, dict] = {}
+
+    async def get(self, guild_id: int) -> dict:
+        links = self._links.get(guild_id)
+        if links is None:
+            links = await self._load(str(guild_id)) or {}
+            links.setdefault("forums", {})
+            links.setdefault("threads", {})
+            self._links[guild_id] = links
+        return links
+
+    async def save(self, guild_id: int):
+        links = self._links.get(guild_id)
+        if links is not None:
+            await self._save(str(guild_id), links)
+
+    async def forget_forum(self, guild_id: int, forum_id: int):
+        links = await self.get(guild_id)
+        links["forums"].pop(str(forum_id), None)
+        links["threads"] = {tid: link for tid, link in links["threads"].items() if link.get("forum") != forum_id}
+        await self.save(guild_id)
+
+
+async def provision_thread(guild, thread, category, index: GuildNameIndex, links: dict) -> str:
+    """Bring one post's role and VC in line with its title.
+
+    Posts that were provisioned before are looked up by id and only touched
+    when they were renamed. Returns "created", "renamed", "adopted" (an
+    existing role and VC were linked to the post) or "unchanged".
+    """
+    title = sanitize_name(thread.name)
+    link = links["threads"].get(str(thread.id))
+    if link:
+        role = guild.get_role(link["role"])
+        channel = guild.get_channel(link["vc"])
+        if role and channel:
+            if link["name"] == title:
+                return "unchanged"
+            await rename_thread_vc(role, channel, title)
+            link["name"] = title
+            return "renamed"
+        # Role or VC was deleted by hand; provision it again below
+
+    async with index.lock(title):
+        role, channel, created = await _ensure_vc(guild, title, category, index)
+    links["threads"][str(thread.id)] = {
+        "forum": thread.parent_id,
+        "name": title,
+        "role": role.id,
+        "vc": channel.id,
+    }
+    return "created" if created else "adopted"
+
+
+async def rename_thread_vc(role: discord.Role, channel: discord.VoiceChannel, title: str):
+    await asyncio.gather(
+        role.edit(name=title, reason="Forum post renamed"),
+        channel.edit(name=title, reason="Forum post renamed")
+    )
+
+
+class ForumAction:
+    """One step of a forum sync or cleanup plan.
+
+    `kind` is "create", "adopt" (role and VC already exist, only link them),
+    "rename", "skip" or "delete". Delete actions carry the role, VC or post
+    to delete in `target`.
+    """
+
+    ICONS = {"create": "➕", "adopt": "🔗", "rename": "✏️", "skip": "⏭️", "delete": "🗑️"}
+
+    def __init__(self, kind: str, thread, name: str, detail: str = "", target=None):
+        self.kind = kind
+        self.thread = thread
+        self.name = name
+        self.detail = detail
+        self.target = target
+
+    def describe(self) -> str:
+        detail = f" ({self.detail})" if self.detail else ""
+        return f"{self.ICONS.get(self.kind, '')} {self.kind} **{self.name}**{detail}"
+
+
+def plan_thread_sync(guild, thread, category, index: GuildNameIndex, links: dict, planned: set[str]) -> ForumAction:
+    """Diff one post against its stored link and the existing roles/VCs.
+
+    `planned` collects titles already planned in this run so posts sharing
+    a title don't plan the same role/VC twice.
+    """
+    title = sanitize_name(thread.name)
+    link = links["threads"].get(str(thread.id))
+    if link and guild.get_role(link["role"]) and guild.get_channel(link["vc"]):
+        if link["name"] == title:
+            return ForumAction("skip", thread, title)
+        return ForumAction("rename", thread, title, f"was {link['name']}")
+
+    has_role = title in planned or index.role(title) is not None
+    has_vc = title in planned or index.voice_channel(title, category) is not None
+    planned.add(title)
+    if has_role and has_vc:
+        return ForumAction("adopt", thread, title)
+    missing = [what for what, exists in (("role", has_role), ("VC", has_vc)) if not exists]
+    return ForumAction("create", thread, title, " + ".join(missing))
+
+
+def plan_forum_cleanup(guild, threads, index: GuildNameIndex, links: dict) -> list[ForumAction]:
+    """List the roles, VCs and posts /cleanup_forum would delete, each once."""
+    actions = []
+    seen = set()
+    for thread in threads:
+        title = sanitize_name(thread.name)
+        link = links["threads"].get(str(thread.id))
+        role = (guild.get_role(link["role"]) if link else None) or index.role(title)
+        channel = (guild.get_channel(link["vc"]) if link else None) or index.voice_channel(title)
+        for target, what in ((role, "role"), (channel, "VC"), (thread, "post")):
+            if target is not None and target.id not in seen:
+                seen.add(target.id)
+                actions.append(ForumAction("delete", thread, target.name, what, target))
+    return actions
+
+
+async def apply_forum_cleanup(actions: list[ForumAction], workers: int = SYNC_WORKERS):
+    """Run the delete actions concurrently. Returns the run_bulk result."""
+
+    async def delete(action):
+        try:
+            await action.target.delete(reason=f"Cleanup forum {action.detail}")
+        except discord.NotFound:
+            # Already gone, which is what we wanted
+            pass
+
+    return await run_bulk(actions, delete, concurrency=workers)
+
+
+class SyncProgress:
+    """Counters for a forum sync run."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.seen = 0
+        self.created = 0
+        self.renamed = 0
+        self.skipped = 0
+        self.failed = 0
+        self.done = False
+        # Every non-skip action, filled in when planning only
+        self.plan: list[ForumAction] = []
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def summary(self) -> str:
+        rate = self.seen / self.elapsed if self.elapsed else 0.0
+        state = "Sync complete" if self.done else "Syncing"
+        return (
+            f"{state}: {self.seen} post(s) processed, {self.created} VC(s) created, {self.renamed} renamed, "
+            f"{self.skipped} unchanged, {self.failed} failed ({rate:.1f} posts/s, {self.elapsed:.1f}s)"
+        )
+
+
+async def sync_forum_threads(guild, forum, category, index: GuildNameIndex, links: dict,
+                             progress: SyncProgress | None = None,
+                             workers: int = SYNC_WORKERS, dry_run: bool = False) -> SyncProgress:
+    """Create the role and VC for every new forum post and rename renamed ones.
+
+    One producer streams active threads and then archived thread pages,
+    diffs each post with plan_thread_sync() and puts the ones needing work
+    into a bounded queue, while `workers` consumers apply them. Fetching
+    archived pages overlaps with the API calls, and unchanged posts cost
+    nothing. With `dry_run` the actions are only collected in
+    `progress.plan`. Pass `progress` to watch the counters while running.
+    """
+    workers = max(1, workers)
+    progress = progress or SyncProgress()
+    planned: set[str] = set()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=workers * 4)
+    if not dry_run:
+        links["forums"][str(forum.id)] = {"category": category.id}
+
+    async def plan(thread):
+        action = plan_thread_sync(guild, thread, category, index, links, planned)
+        if action.kind == "skip":
+            progress.skipped += 1
+            progress.seen += 1
+        elif dry_run:
+            progress.plan.append(action)
+            progress.seen += 1
+        else:
+            await queue.put(action)
+
+    async def produce():
+        seen_ids = set()
+        for thread in forum.threads:
+            seen_ids.add(thread.id)
+            await plan(thread)
+        async for thread in forum.archived_threads(limit=None):
+            if thread.id not in seen_ids:
+                await plan(thread)
+
+    async def consume():
+        while True:
+            action = await queue.get()
+            if action is None:
+                return
+            try:
+                result = await provision_thread(guild, action.thread, category, index, links)
+                if result == "created":
+                    progress.created += 1
+                elif result == "renamed":
+                    progress.renamed += 1
+            except Exception as e:
+                progress.failed += 1
+                print(f"Failed to sync forum post {action.thread.name}: {e}")
+            finally:
+                progress.seen += 1
+
+    consumers = [] if dry_run else [asyncio.create_task(consume()) for _ in range(workers)]
+    try:
+        await produce()
+    finally:
+        for _ in consumers:
+            await queue.put(None)
+        await asyncio.gather(*consumers)
+    progress.done = True
+    return progress
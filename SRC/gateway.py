@@ -0,0 +1,111 @@
+import os
+import sys
+import asyncio
+import discord
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Intents every bot needs, on top of what the cogs ask for
+BASE_INTENTS = ("guilds",)
+
+# Comma separated intent names. "auto" (default) uses only what the loaded
+# cogs declare in REQUIRED_INTENTS, "all" restores Intents.all().
+BOT_INTENTS = os.environ.get("BOT_INTENTS", "auto").strip().lower()
+# Extra intent names added to the automatic set, e.g. "message_content"
+BOT_EXTRA_INTENTS = [i.strip() for i in os.environ.get("BOT_EXTRA_INTENTS", "").split(",") if i.strip()]
+
+# "all" caches every member the gateway tells us about, "voice" only members
+# in a voice channel (plus chunked guilds), "none" keeps nothing beyond chunks
+MEMBER_CACHE = os.environ.get("MEMBER_CACHE", "all").strip().lower()
+
+# Request every guild's member list while connecting. Off by default: guilds
+# are chunked on first use through ensure_chunked() instead.
+CHUNK_GUILDS_AT_STARTUP = os.environ.get("CHUNK_GUILDS_AT_STARTUP", "false").lower() == "true"
+
+# guild id -> running chunk request, so concurrent callers share one request
+_chunk_tasks: dict[int, asyncio.Task] = {}
+
+
+def build_intents(cogs=()) -> discord.Intents:
+    """Build the gateway intents for the given cog classes.
+
+    Each cog lists the intent flags it relies on in a REQUIRED_INTENTS class
+    attribute, so presence and typing events are only received if a cog
+    actually needs them.
+    """
+    if BOT_INTENTS == "all":
+        return discord.Intents.all()
+
+    if BOT_INTENTS == "auto":
+        names = set(BASE_INTENTS)
+        for cog in cogs:
+            names.update(getattr(cog, "REQUIRED_INTENTS", ()))
+    else:
+        names = {i.strip() for i in BOT_INTENTS.split(",") if i.strip()}
+    names.update(BOT_EXTRA_INTENTS)
+
+    intents = discord.Intents.none()
+    for name in names:
+        if name not in discord.Intents.VALID_FLAGS:
+            raise ValueError(f"Unknown gateway intent: {name}")
+        setattr(intents, name, True)
+    return intents
+
+
+def build_member_cache_flags(intents: discord.Intents) -> discord.MemberCacheFlags:
+    if MEMBER_CACHE == "none":
+        return discord.MemberCacheFlags.none()
+    if MEMBER_CACHE == "voice":
+        flags = discord.MemberCacheFlags.none()
+        flags.voice = intents.voice_states
+        return flags
+    return discord.MemberCacheFlags.from_intents(intents)
+
+
+def describe_intents(intents: discord.Intents) -> str:
+    return ", ".join(name for name, enabled in intents if enabled)
+
+
+async def ensure_chunked(guild: discord.Guild):
+    """Make sure the guild's full member list is cached, chunking it on first use."""
+    if guild.chunked:
+        return
+    task = _chunk_tasks.get(guild.id)
+    if task is None:
+        task = asyncio.create_task(guild.chunk(cache=True))
+        _chunk_tasks[guild.id] = task
+        task.add_done_callback(lambda _: _chunk_tasks.pop(guild.id, None))
+        print(f"Chunking members of {guild.name} on first use")
+    await asyncio.shield(task)
+
+
+def memory_usage_mb() -> float | None:
+    """Current resident set size of this process in MB, if the platform tells us."""
+    try:
+        with open("/proc/self/status", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is not None:
+        # Peak rather than current, but better than nothing (bytes on macOS, kB elsewhere)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    return None
+
+
+def memory_report(bot) -> str:
+    rss = memory_usage_mb()
+    rss_text = f"{rss:.1f} MB RSS" if rss is not None else "RSS unknown"
+    members = sum(g.member_count or 0 for g in bot.guilds)
+    cached = sum(len(g.members) for g in bot.guilds)
+    chunked = sum(1 for g in bot.guilds if g.chunked)
+    return (
+        f"{rss_text}, {len(bot.guilds)} guild(s) ({chunked} chunked), "
+        f"{cached}/{members} member(s) cached, {len(bot.users)} user(s)"
+    )
@@ -0,0 +1,109 @@
+import re
+import math
+import time
+import aiohttp
+import discord
+from metrics import Counter, Gauge, Histogram
+from loop_monitor import tag_current_task
+
+
+# Commands can wait on a view for minutes, so the buckets go further than the defaults
+COMMAND_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+COMMAND_INVOCATIONS = Counter("discord_app_command_invocations_total", "App command invocations by command and outcome")
+COMMAND_TIME = Histogram("discord_app_command_seconds", "Time from invocation until the command returned", COMMAND_BUCKETS)
+COMMAND_ERRORS = Counter("discord_app_command_errors_total", "App command errors by command and exception type")
+HTTP_REQUESTS = Counter("discord_http_requests_total", "Discord REST calls by method, route and status")
+HTTP_TIME = Histogram("discord_http_request_seconds", "Discord REST call duration by method and route")
+RATE_LIMIT_HITS = Counter("discord_rate_limit_hits_total", "429 responses by route and rate limit scope")
+RATE_LIMIT_RETRY_AFTER = Counter("discord_rate_limit_retry_after_seconds_total", "Sum of Retry-After seconds of 429 responses")
+
+_API_PREFIX = re.compile(r"^/api/v\d+")
+_SNOWFLAKE = re.compile(r"/\d{15,21}(?=/|$)")
+# Webhook and interaction URLs carry a token after the id
+_TOKEN = re.compile(r"(/(?:webhooks|interactions)/:id)/[^/]+")
+
+
+def normalize_route(path: str) -> str:
+    """Turn a request path into a low-cardinality route label."""
+    path = _API_PREFIX.sub("", path)
+    path = _SNOWFLAKE.sub("/:id", path)
+    return _TOKEN.sub(r"\1/:token", path)
+
+
+def http_trace() -> aiohttp.TraceConfig:
+    """aiohttp trace hooks counting every REST attempt, including 429s discord.py retries."""
+    trace = aiohttp.TraceConfig()
+
+    async def on_request_start(session, ctx, params):
+        ctx.started = time.perf_counter()
+
+    async def on_request_end(session, ctx, params):
+        route = normalize_route(params.url.path)
+        status = params.response.status
+        HTTP_REQUESTS.inc(method=params.method, route=route, status=str(status))
+        HTTP_TIME.observe(time.perf_counter() - ctx.started, method=params.method, route=route)
+        if status == 429:
+            headers = params.response.headers
+            RATE_LIMIT_HITS.inc(route=route, scope=headers.get("X-RateLimit-Scope", "unknown"))
+            try:
+                RATE_LIMIT_RETRY_AFTER.inc(float(headers.get("Retry-After", 0)), route=route)
+            except ValueError:
+                pass
+
+    async def on_request_exception(session, ctx, params):
+        route = normalize_route(params.url.path)
+        HTTP_REQUESTS.inc(method=params.method, route=route, status="error")
+
+    trace.on_request_start.append(on_request_start)
+    trace.on_request_end.append(on_request_end)
+    trace.on_request_exception.append(on_request_exception)
+    return trace
+
+
+def _command_name(interaction: discord.Interaction, command=None) -> str:
+    command = command or interaction.command
+    return command.qualified_name if command else "unknown"
+
+
+def _record(interaction: discord.Interaction, name: str, status: str):
+    COMMAND_INVOCATIONS.inc(command=name, status=status)
+    started = interaction.extras.get("started")
+    if started is not None:
+        COMMAND_TIME.observe(time.perf_counter() - started, command=name)
+
+
+def instrument_bot(bot):
+    """Record app command counts, latency and errors, and export gateway latency."""
+    tree = bot.tree
+    check = tree.interaction_check
+    default_on_error = tree.on_error
+
+    async def interaction_check(interaction: discord.Interaction) -> bool:
+        interaction.extras["started"] = time.perf_counter()
+        # Loop stalls while this task runs get blamed on the command
+        tag_current_task(f"command:{_command_name(interaction)}")
+        return await check(interaction)
+
+    async def on_app_command_completion(interaction: discord.Interaction, command):
+        _record(interaction, _command_name(interaction, command), "ok")
+
+    async def on_error(interaction: discord.Interaction, error: discord.app_commands.AppCommandError):
+        name = _command_name(interaction)
+        COMMAND_ERRORS.inc(command=name, error=type(getattr(error, "original", error)).__name__)
+        _record(interaction, name, "error")
+        # Keep the default traceback logging
+        await default_on_error(interaction, error)
+
+    tree.interaction_check = interaction_check
+    tree.error(on_error)
+    bot.add_listener(on_app_command_completion, name="on_app_command_completion")
+
+    def gateway_latency():
+        if isinstance(bot, discord.AutoShardedClient):
+            latencies = bot.latencies
+        else:
+            latencies = [(bot.shard_id or 0, bot.latency)]
+        return {(("shard", str(shard_id)),): latency for shard_id, latency in latencies if math.isfinite(latency)}
+
+    Gauge("discord_gateway_latency_seconds", "Heartbeat latency per gateway shard", collect=gateway_latency)
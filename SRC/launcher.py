@@ -0,0 +1,124 @@
+"""Run VCControl as several processes, each owning a contiguous range of shards.
+
+    python launcher.py --processes 4 [--shard-count 16] [--test]
+
+Every process connects its own shards and runs its own event loop. They share
+the Postgres config store (DATABASE_URL) and report shard health through it,
+which /shard_status reads back.
+"""
+import os
+import time
+import asyncio
+import argparse
+import multiprocessing
+import aiohttp
+import dotenv
+dotenv.load_dotenv()
+
+
+BOT_PROCESSES = int(os.environ.get("BOT_PROCESSES", "2"))
+# Seconds to wait before restarting a process that exited
+RESTART_DELAY = float(os.environ.get("LAUNCHER_RESTART_DELAY", "10"))
+# Configs saved by one process reach the others' cross-guild reports within this many seconds
+DEFAULT_CONFIG_CACHE_TTL = "60"
+
+
+def split_shards(shard_count: int, processes: int) -> list[list[int]]:
+    """Split shard ids 0..shard_count-1 into `processes` contiguous ranges."""
+    processes = max(1, min(processes, shard_count))
+    size, extra = divmod(shard_count, processes)
+    ranges = []
+    start = 0
+    for i in range(processes):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+
+async def recommended_shard_count(token: str) -> int:
+    async with aiohttp.ClientSession() as session:
+        async with session.get(
+            "https://discord.com/api/v10/gateway/bot",
+            headers={"Authorization": f"Bot {token}"}
+        ) as resp:
+            resp.raise_for_status()
+            data = await resp.json()
+    return int(data["shards"])
+
+
+def run_process(index: int, label: str, shard_ids: list[int], shard_count: int, test_run: bool):
+    # Set before main is imported so the bot modules pick it up
+    os.environ["SHARD_LABEL"] = label
+    # One metrics port per process, counting up from METRICS_PORT
+    metrics_port = int(os.environ.get("METRICS_PORT", "9108"))
+    if metrics_port:
+        os.environ["METRICS_PORT"] = str(metrics_port + index)
+    from main import VCControl
+    print(f"[{label}] Starting shards {shard_ids[0]}-{shard_ids[-1]} of {shard_count} (pid {os.getpid()})")
+    VCControl(shard_ids=shard_ids, shard_count=shard_count, sharded=True).run(test_run=test_run)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run VCControl across several shard processes")
+    parser.add_argument("--processes", type=int, default=BOT_PROCESSES)
+    parser.add_argument("--shard-count", type=int, default=int(os.environ.get("SHARD_COUNT", "0")),
+                        help="total shards; asks Discord for the recommended count when omitted")
+    parser.add_argument("--test", action="store_true", default=os.getenv("TEST_MODE", "false").lower() == "true",
+                        help="use DISCORD_TEST_TOKEN and the test configs")
+    args = parser.parse_args()
+
+    token = os.environ.get("DISCORD_TEST_TOKEN" if args.test else "DISCORD_TOKEN")
+    if not token:
+        raise RuntimeError("Discord token not provided")
+
+    if not os.environ.get("DATABASE_URL"):
+        print("Warning: DATABASE_URL is not set; processes will share the config files "
+              "but only see each other's changes through CONFIG_CACHE_TTL reloads")
+    os.environ.setdefault("CONFIG_CACHE_TTL", DEFAULT_CONFIG_CACHE_TTL)
+
+    shard_count = args.shard_count or asyncio.run(recommended_shard_count(token))
+    ranges = split_shards(shard_count, args.processes)
+    print(f"Launching {len(ranges)} process(es) for {shard_count} shard(s)")
+
+    ctx = multiprocessing.get_context("spawn")
+    processes: dict[str, tuple[multiprocessing.Process, int, list[int]]] = {}
+
+    def start(index: int, label: str, shard_ids: list[int]):
+        process = ctx.Process(target=run_process, args=(index, label, shard_ids, shard_count, args.test), name=label)
+        process.start()
+        processes[label] = (process, index, shard_ids)
+
+    for i, shard_ids in enumerate(ranges):
+        start(i, f"shards-{i}", shard_ids)
+
+    # label -> when to restart a process that exited
+    restart_at: dict[str, float] = {}
+    try:
+        # Restart any process that dies; its shards would otherwise stay offline
+        while True:
+            time.sleep(1)
+            now = time.monotonic()
+            for label, (process, index, shard_ids) in list(processes.items()):
+                if process.is_alive():
+                    continue
+                if label not in restart_at:
+                    print(f"[{label}] exited with code {process.exitcode}, restarting in {RESTART_DELAY:.0f}s")
+                    restart_at[label] = now + RESTART_DELAY
+                elif now >= restart_at[label]:
+                    del restart_at[label]
+                    start(index, label, shard_ids)
+    except KeyboardInterrupt:
+        print("Stopping shard processes...")
+        # SIGTERM lets each bot close cleanly (flushing its audit log) before exiting
+        for process, _, _ in processes.values():
+            process.terminate()
+        for label, (process, _, _) in processes.items():
+            process.join(timeout=30)
+            if process.is_alive():
+                print(f"[{label}] didn't stop in time, killing it")
+                process.kill()
+
+
+if __name__ == "__main__":
+    main()
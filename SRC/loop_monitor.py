@@ -0,0 +1,151 @@
+import os
+import sys
+import time
+import asyncio
+import threading
+import traceback
+import weakref
+from metrics import Counter, Gauge, Histogram
+
+
+# Seconds between heartbeats; a heartbeat that is late by more than
+# SLOW_CALLBACK_THRESHOLD seconds means something blocked the loop.
+LOOP_LAG_INTERVAL = float(os.environ.get("LOOP_LAG_INTERVAL", "0.5"))
+SLOW_CALLBACK_THRESHOLD = float(os.environ.get("SLOW_CALLBACK_THRESHOLD", "0.25"))  # 0 disables the monitor
+# Innermost frames kept from a captured stack
+SLOW_CALLBACK_STACK_DEPTH = int(os.environ.get("SLOW_CALLBACK_STACK_DEPTH", "15"))
+# Seconds before the same source gets its stack logged again
+SLOW_CALLBACK_LOG_COOLDOWN = float(os.environ.get("SLOW_CALLBACK_LOG_COOLDOWN", "30"))
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LOOP_LAG = Histogram("event_loop_lag_seconds", "How late event loop heartbeats ran", LAG_BUCKETS)
+LOOP_LAG_LAST = Gauge("event_loop_lag_last_seconds", "Lag of the most recent event loop heartbeat")
+SLOW_CALLBACKS = Counter("event_loop_slow_callbacks_total", "Loop stalls over the threshold by the command/listener running")
+LOOP_BLOCKED = Counter("event_loop_blocked_seconds_total", "Seconds the event loop was blocked, by the command/listener running")
+
+# task -> what it is running, e.g. "command:verify_user"
+_task_labels: "weakref.WeakKeyDictionary[asyncio.Task, str]" = weakref.WeakKeyDictionary()
+
+
+def tag_current_task(label: str):
+    """Name what the current task is doing so loop stalls can be attributed to it."""
+    task = asyncio.current_task()
+    if task is not None:
+        _task_labels[task] = label
+
+
+def describe_task(task: asyncio.Task | None) -> str:
+    if task is None:
+        return "callback"
+    label = _task_labels.get(task)
+    if label:
+        return label
+    name = task.get_name()
+    # discord.py names event tasks "discord.py: on_<event>"
+    if name.startswith("discord.py: "):
+        return "listener:" + name[len("discord.py: "):]
+    return "task:" + name
+
+
+class LoopStall:
+    """Stack and source captured while the loop was stuck on one heartbeat."""
+
+    def __init__(self, source: str, stack: list[str]):
+        self.source = source
+        self.stack = stack
+
+
+class LoopMonitor:
+    """Measures event loop lag and catches callbacks that block it.
+
+    A heartbeat coroutine records how late each tick runs. A watchdog thread
+    notices when a tick is overdue by more than `threshold`. While the loop is
+    still stuck it captures the loop thread's stack and the task that was
+    running, so the stall can be pinned on a slash command or listener. The
+    late heartbeat then logs the stall and counts it in the metrics.
+    """
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL, threshold: float = SLOW_CALLBACK_THRESHOLD):
+        self.interval = interval
+        self.threshold = threshold
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._stopped = threading.Event()
+        # Heartbeat number and when it is due; read by the watchdog thread
+        self._tick = 0
+        self._due = 0.0
+        self._stalls: dict[int, LoopStall] = {}
+        self._last_logged: dict[str, float] = {}
+
+    def start(self):
+        """Start monitoring the running loop. Must be called from inside it."""
+        if self.threshold <= 0 or self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._due = time.perf_counter() + self.interval
+        self._task = asyncio.create_task(self._heartbeat(), name="loop-monitor")
+        threading.Thread(target=self._watch, name="loop-watchdog", daemon=True).start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            lag = max(0.0, now - self._due)
+            # Move the deadline before the tick so the watchdog never pairs
+            # the new tick with the old deadline
+            self._due = now + self.interval
+            tick = self._tick
+            self._tick += 1
+
+            LOOP_LAG.observe(lag)
+            LOOP_LAG_LAST.set(lag)
+            stall = self._stalls.pop(tick, None)
+            # A capture that finished after its tick was popped can't be
+            # reported any more; drop it so it doesn't stay around forever
+            for stale in [t for t in list(self._stalls) if t < self._tick]:
+                self._stalls.pop(stale, None)
+            if lag >= self.threshold:
+                self._report(lag, stall)
+
+    def _watch(self):
+        while not self._stopped.wait(self.threshold / 2):
+            tick = self._tick
+            if tick in self._stalls or time.perf_counter() - self._due < self.threshold:
+                continue
+            stall = self._capture()
+            # The loop may have come back (and popped the tick) while capturing
+            if stall is not None and self._tick == tick:
+                self._stalls[tick] = stall
+
+    def _capture(self) -> LoopStall | None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return None
+        stack = traceback.format_stack(frame)[-SLOW_CALLBACK_STACK_DEPTH:]
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            task = None
+        return LoopStall(describe_task(task), stack)
+
+    def _report(self, lag: float, stall: LoopStall | None):
+        source = stall.source if stall else "unknown"
+        SLOW_CALLBACKS.inc(source=source)
+        LOOP_BLOCKED.inc(lag, source=source)
+
+        now = time.monotonic()
+        if now - self._last_logged.get(source, 0.0) < SLOW_CALLBACK_LOG_COOLDOWN:
+            return
+        self._last_logged[source] = now
+        print(f"Event loop blocked for {lag * 1000:.0f} ms in {source}")
+        if stall:
+            print("".join(stall.stack).rstrip())
@@ -1,36 +1,188 @@
 import modulefinder
 import os
+import json
+import signal
+import asyncio
+import hashlib
 import discord
 from discord.ext import commands
-from slash_commands import VCSlashCommands, load_config
+from slash_commands import VCSlashCommands, get_cached_configs_async, load_bot_state_async, save_bot_state_async
+from admin import AdminCommands
+from shards import ShardMonitor, process_label
+from instrumentation import http_trace, instrument_bot
+from loop_monitor import LoopMonitor
+import metrics
+from gateway import (
+    CHUNK_GUILDS_AT_STARTUP, MEMBER_CACHE, build_intents, build_member_cache_flags, describe_intents,
+    memory_report, memory_usage_mb
+)
 import dotenv
 dotenv.load_dotenv()
 
 
+# Comma separated guild ids to sync the command tree to instead of globally.
+# Guild commands show up instantly, global ones can take a while to propagate.
+DEV_GUILD_IDS = [int(g) for g in os.environ.get("DEV_GUILD_IDS", "").replace(" ", "").split(",") if g]
+# Set to sync even when the command tree hash hasn't changed
+FORCE_TREE_SYNC = os.environ.get("FORCE_TREE_SYNC", "false").lower() == "true"
+TREE_STATE_KEY = "command_tree"
+
+# BOT_SHARDED=true runs an AutoShardedBot. SHARD_COUNT / SHARD_IDS (e.g. "0-3"
+# or "0,1,2") pin the shards; launcher.py sets them per process.
+BOT_SHARDED = os.environ.get("BOT_SHARDED", "false").lower() == "true"
+
+
+def parse_shard_ids(value: str | None) -> list[int] | None:
+    """Parse "0-3" or "0,1,5" into a list of shard ids."""
+    if not value:
+        return None
+    shard_ids = []
+    for part in value.replace(" ", "").split(","):
+        if "-" in part:
+            first, last = part.split("-", 1)
+            shard_ids.extend(range(int(first), int(last) + 1))
+        elif part:
+            shard_ids.append(int(part))
+    return shard_ids
+
+
+def command_tree_fingerprint(tree: discord.app_commands.CommandTree, guild: discord.abc.Snowflake | None = None) -> str:
+    """Hash of the command payloads tree.sync() would upload for `guild` (None = global)."""
+    payload = sorted(
+        (cmd.to_dict(tree) for cmd in tree.get_commands(guild=guild)),
+        key=lambda c: (c.get("type", 1), c["name"])
+    )
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
 class VCControl:
-    def __init__(self, token: str | None = None):
+    def __init__(self, token: str | None = None, shard_ids: list[int] | None = None,
+                 shard_count: int | None = None, sharded: bool | None = None):
         self.token = token
-        self.intents = discord.Intents.all()
-        self.intents.message_content = True
-        self.bot = commands.Bot(command_prefix=commands.when_mentioned, intents=self.intents)
-        # register on_ready and add the slash command Cog
+        self.label = process_label()
+        shard_ids = shard_ids if shard_ids is not None else parse_shard_ids(os.environ.get("SHARD_IDS"))
+        shard_count = shard_count or int(os.environ.get("SHARD_COUNT", "0")) or None
+        # discord.py only rejects these once it connects; fail before logging in
+        if shard_ids and not shard_count:
+            raise RuntimeError("SHARD_IDS is set but SHARD_COUNT isn't; set SHARD_COUNT to the total number of shards")
+        if shard_ids and not all(0 <= shard_id < shard_count for shard_id in shard_ids):
+            raise RuntimeError(f"SHARD_IDS {shard_ids} don't fit SHARD_COUNT={shard_count} (valid ids are 0-{shard_count - 1})")
+        self.sharded = (BOT_SHARDED or bool(shard_ids or shard_count)) if sharded is None else sharded
+        # Held so the loop's weak reference isn't the only one while the bot closes
+        self._close_task: asyncio.Task | None = None
+
+        # Only the intents the cogs need; BOT_INTENTS=all restores the old behaviour
+        self.intents = build_intents([VCSlashCommands, AdminCommands])
+        options = dict(
+            command_prefix=commands.when_mentioned,
+            intents=self.intents,
+            member_cache_flags=build_member_cache_flags(self.intents),
+            chunk_guilds_at_startup=CHUNK_GUILDS_AT_STARTUP,
+            http_trace=http_trace()
+        )
+        if self.sharded:
+            # shard_count None lets discord.py ask the gateway for the recommended count
+            self.bot = commands.AutoShardedBot(shard_ids=shard_ids, shard_count=shard_count, **options)
+        else:
+            self.bot = commands.Bot(**options)
+        self.shard_monitor = ShardMonitor(self.bot, self.label, save=save_bot_state_async)
+        instrument_bot(self.bot)
+        self.loop_monitor = LoopMonitor()
+
+        # setup_hook runs once after login, before the gateway connects;
+        # on_ready fires again on every reconnect
+        self.bot.setup_hook = self.setup_hook
         self.bot.add_listener(self.on_ready, name="on_ready")
-        
+        self.bot.add_listener(self.on_shard_ready, name="on_shard_ready")
+        self.bot.add_listener(self.on_shard_disconnect, name="on_shard_disconnect")
+        self.bot.add_listener(self.on_shard_resumed, name="on_shard_resumed")
 
-    async def on_ready(self):
-        # Add the cog if it hasn't been added yet
-        if not any(isinstance(c, VCSlashCommands) for c in self.bot.cogs.values()):
-            from slash_commands import VCSlashCommands
-            await self.bot.add_cog(VCSlashCommands(self.bot))  # ✅ Await it
+    async def setup_hook(self):
+        # Table setup and the first config load run on the DB / storage
+        # executors, so the loop never waits on Postgres or the disk
+        if os.environ.get("DATABASE_URL"):
+            try:
+                import db as _db
+                await _db.ensure_table_async()
+            except Exception as e:
+                print("DB initialization failed:", e)
+        await get_cached_configs_async()
+        await self.bot.add_cog(VCSlashCommands(self.bot))
+        await self.bot.add_cog(AdminCommands(self.bot))
+        # Every launcher process shares one application; let the one
+        # running shard 0 take care of the command tree
+        shard_ids = getattr(self.bot, "shard_ids", None)
+        if not shard_ids or 0 in shard_ids:
+            await self.sync_tree()
+        self.shard_monitor.start()
+        self.loop_monitor.start()
+        # The launcher and container runtimes stop the bot with SIGTERM; close
+        # it cleanly so cogs unload and queued audit log embeds get sent
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, self.on_sigterm)
+        except (NotImplementedError, RuntimeError):
+            # No loop signal handlers on Windows
+            pass
+
+    def on_sigterm(self):
+        if self._close_task is None:
+            print(f"[{self.label}] SIGTERM received, shutting down")
+            self._close_task = asyncio.create_task(self.bot.close())
+
+    async def sync_tree(self):
+        """Sync the command tree, skipping scopes whose commands haven't changed.
+
+        The hash of what was last synced is stored per application and scope,
+        so restarts and reconnects don't hit the heavily rate-limited sync
+        endpoint. With DEV_GUILD_IDS set, commands go to those guilds only.
+        """
+        tree = self.bot.tree
+        if DEV_GUILD_IDS:
+            scopes = [discord.Object(id=gid) for gid in DEV_GUILD_IDS]
+            for guild in scopes:
+                tree.copy_global_to(guild=guild)
+        else:
+            scopes = [None]
 
-        # Sync slash commands for the guild
         try:
-            await self.bot.tree.sync()
-            print(f"Synced command tree for {self.bot.user} (ID: {self.bot.user.id})")
+            hashes = await load_bot_state_async(TREE_STATE_KEY) or {}
         except Exception as e:
-            print("Failed to sync command tree:", e)
+            print("Failed to load command tree hashes:", e)
+            hashes = {}
+
+        changed = False
+        for guild in scopes:
+            scope = f"{self.bot.application_id}:{guild.id if guild else 'global'}"
+            fingerprint = command_tree_fingerprint(tree, guild)
+            if not FORCE_TREE_SYNC and hashes.get(scope) == fingerprint:
+                print(f"Command tree unchanged for {scope}, skipping sync")
+                continue
+            try:
+                synced = await tree.sync(guild=guild)
+                hashes[scope] = fingerprint
+                changed = True
+                print(f"Synced {len(synced)} command(s) for {scope}")
+            except Exception as e:
+                print("Failed to sync command tree:", e)
+
+        if changed:
+            try:
+                await save_bot_state_async(TREE_STATE_KEY, hashes)
+            except Exception as e:
+                print("Failed to save command tree hashes:", e)
+
+    async def on_ready(self):
+        print(f"[{self.label}] Logged in as {self.bot.user} (ID: {self.bot.user.id})")
+        print(f"[{self.label}] Memory after ready: {memory_report(self.bot)}")
 
-        print(f"Logged in as {self.bot.user}")
+    async def on_shard_ready(self, shard_id: int):
+        print(f"[{self.label}] Shard {shard_id} ready")
+
+    async def on_shard_disconnect(self, shard_id: int):
+        print(f"[{self.label}] Shard {shard_id} disconnected")
+
+    async def on_shard_resumed(self, shard_id: int):
+        print(f"[{self.label}] Shard {shard_id} resumed")
 
     def run(self, token: str | None = None, test_run: bool = False):
         if test_run: 
@@ -46,23 +198,25 @@ class VCControl:
             os.environ["VC_CONTROL_TESTING"] = "1"
         else:
             os.environ.pop("VC_CONTROL_TESTING", None)
-        # If a DATABASE_URL is provided, ensure DB table exists before loading
-        if os.environ.get("DATABASE_URL"):
-            try:
-                import db as _db
-                _db.ensure_table()
-            except Exception as e:
-                print("DB initialization failed:", e)
 
-        load_config()
+        metrics.start_http_server()
+        rss = memory_usage_mb()
+        print(
+            f"Gateway intents: {describe_intents(self.intents)}; member cache: {MEMBER_CACHE}; "
+            f"chunk at startup: {CHUNK_GUILDS_AT_STARTUP}; RSS before connect: "
+            + (f"{rss:.1f} MB" if rss is not None else "unknown")
+        )
         self.bot.run(token)
 
-start_in_test = os.getenv("TEST_MODE", "false").lower() == "true"
-if start_in_test:
-    print("Starting in test mode...")
-    test_run = True
-else:
-    print("Starting in production mode...")
-    test_run = False
-vc_bot = VCControl()
-vc_bot.run(test_run=test_run)
+
+if __name__ == "__main__":
+    start_in_test = os.getenv("TEST_MODE", "false").lower() == "true"
+    if start_in_test:
+        print("Starting in test mode...")
+        test_run = True
+    else:
+        print("Starting in production mode...")
+        test_run = False
+    vc_bot = VCControl()
+    vc_bot.run(test_run=test_run)
+
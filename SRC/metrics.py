@@ -0,0 +1,214 @@
+import os
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Latency buckets in seconds, roughly matching the Prometheus client defaults.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Local HTTP endpoint serving REGISTRY in Prometheus text format; port 0 disables it
+METRICS_HOST = os.environ.get("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.environ.get("METRICS_PORT", "9108"))
+
+# name -> metric, filled in as metrics are created
+REGISTRY: dict[str, "Metric"] = {}
+
+_server: ThreadingHTTPServer | None = None
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: tuple, extra: tuple = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class Metric:
+    """Base for the metric types; registers itself in REGISTRY by name."""
+
+    type = "untyped"
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._lock = threading.Lock()
+        REGISTRY[name] = self
+
+    def render(self) -> list[str]:
+        lines = []
+        if self.description:
+            lines.append(f"# HELP {self.name} {_escape(self.description)}")
+        lines.append(f"# TYPE {self.name} {self.type}")
+        return lines + self._samples()
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """Thread-safe monotonically increasing counter with optional labels."""
+
+    type = "counter"
+
+    def __init__(self, name: str, description: str = ""):
+        super().__init__(name, description)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._values)
+
+    def _samples(self) -> list[str]:
+        return [f"{self.name}{_format_labels(key)} {_format_value(v)}" for key, v in self.snapshot().items()]
+
+
+class Gauge(Metric):
+    """Value that goes up and down.
+
+    Pass `collect` to compute the value(s) at scrape time instead of setting
+    them; it returns a number or a {label tuple: value} dict and is called
+    from the metrics server thread, so it must only read simple attributes.
+    """
+
+    type = "gauge"
+
+    def __init__(self, name: str, description: str = "", collect=None):
+        super().__init__(name, description)
+        self._values: dict[tuple, float] = {}
+        self._collect = collect
+
+    def set(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = value
+
+    def snapshot(self) -> dict:
+        if self._collect is not None:
+            values = self._collect()
+            return values if isinstance(values, dict) else {(): values}
+        with self._lock:
+            return dict(self._values)
+
+    def _samples(self) -> list[str]:
+        try:
+            values = self.snapshot()
+        except Exception as e:
+            print(f"Failed to collect {self.name}:", e)
+            return []
+        return [
+            f"{self.name}{_format_labels(key)} {_format_value(v)}"
+            for key, v in values.items() if v is not None
+        ]
+
+
+class Histogram(Metric):
+    """Thread-safe cumulative histogram with optional labels."""
+
+    type = "histogram"
+
+    def __init__(self, name: str, description: str = "", buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, description)
+        self.buckets = tuple(sorted(buckets))
+        # label tuple -> [bucket counts..., +Inf count], sum
+        self._counts: dict[tuple, list[int]] = {}
+        self._sums: dict[tuple, float] = {}
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            counts[-1] += 1
+            self._sums[key] += value
+
+    def snapshot(self) -> dict:
+        """Return {labels: {"buckets": {bound: count}, "count": n, "sum": s}}."""
+        with self._lock:
+            return {
+                key: {
+                    "buckets": dict(zip(self.buckets, counts[:-1])),
+                    "count": counts[-1],
+                    "sum": self._sums[key],
+                }
+                for key, counts in self._counts.items()
+            }
+
+    def _samples(self) -> list[str]:
+        lines = []
+        for key, data in self.snapshot().items():
+            for bound, count in data["buckets"].items():
+                lines.append(f"{self.name}_bucket{_format_labels(key, (('le', _format_value(bound)),))} {count}")
+            lines.append(f"{self.name}_bucket{_format_labels(key, (('le', '+Inf'),))} {data['count']}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(data['sum'])}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {data['count']}")
+        return lines
+
+
+def render() -> str:
+    """Every registered metric in the Prometheus text exposition format."""
+    lines = []
+    for metric in list(REGISTRY.values()):
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would drown out the bot's own output
+        pass
+
+
+def start_http_server(port: int = METRICS_PORT, host: str = METRICS_HOST) -> ThreadingHTTPServer | None:
+    """Serve /metrics from a daemon thread. Returns None when disabled or already running."""
+    global _server
+    if not port or _server is not None:
+        return None
+    try:
+        _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        print(f"Failed to start metrics server on {host}:{port}:", e)
+        return None
+    _server.daemon_threads = True
+    threading.Thread(target=_server.serve_forever, name="metrics", daemon=True).start()
+    print(f"Serving metrics on http://{host}:{port}/metrics")
+    return _server
+
+
+def stop_http_server():
+    global _server
+    if _server is not None:
+        _server.shutdown()
+        _server.server_close()
+        _server = None
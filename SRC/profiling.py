@@ -0,0 +1,150 @@
+import io
+import sys
+import time
+import pstats
+import asyncio
+import cProfile
+import threading
+import tracemalloc
+from collections import Counter
+
+
+# Seconds between stack samples in sampling mode
+SAMPLE_INTERVAL = 0.005
+# Frames kept per allocation traceback in tracemalloc mode
+TRACEMALLOC_FRAMES = 10
+# Most common collapsed stacks written in sampling mode
+MAX_COLLAPSED_STACKS = 500
+
+# Only one profiler may run at a time
+_lock = asyncio.Lock()
+
+
+def is_running() -> bool:
+    return _lock.locked()
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename}:{frame.f_lineno})"
+
+
+async def profile_cprofile(seconds: float, top: int) -> str:
+    """cProfile the event loop thread for `seconds`; returns the pstats report."""
+    async with _lock:
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.disable()
+        elapsed = time.perf_counter() - started
+
+    out = io.StringIO()
+    out.write(f"cProfile of the event loop thread for {elapsed:.1f}s\n\n")
+    stats = pstats.Stats(profiler, stream=out)
+    stats.strip_dirs()
+    out.write("=== By cumulative time ===\n")
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    out.write("\n=== By own time ===\n")
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(top)
+    return out.getvalue()
+
+
+async def profile_sampling(seconds: float, top: int) -> str:
+    """Sample the event loop thread's stack every SAMPLE_INTERVAL for `seconds`.
+
+    Much cheaper than cProfile, so it is the safer choice under load. The
+    report lists the hottest functions by own and total samples, followed by
+    collapsed stacks that flamegraph tools can read. Samples land where the
+    loop thread releases the GIL, so blocking I/O shows up well but pure
+    Python CPU work is under-represented; use cProfile for that.
+    """
+    async with _lock:
+        loop_thread_id = threading.get_ident()
+        stop = threading.Event()
+        own: Counter = Counter()
+        total: Counter = Counter()
+        stacks: Counter = Counter()
+        samples = 0
+
+        def sample():
+            nonlocal samples
+            while not stop.wait(SAMPLE_INTERVAL):
+                frame = sys._current_frames().get(loop_thread_id)
+                if frame is None:
+                    continue
+                names = []
+                while frame is not None:
+                    names.append(_frame_name(frame))
+                    frame = frame.f_back
+                samples += 1
+                own[names[0]] += 1
+                for name in set(names):
+                    total[name] += 1
+                stacks[";".join(reversed(names))] += 1
+
+        sampler = threading.Thread(target=sample, name="profiler-sampler", daemon=True)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            stop.set()
+            # The sampler stops within one interval; join off the loop anyway
+            await asyncio.to_thread(sampler.join)
+        elapsed = time.perf_counter() - started
+
+    out = io.StringIO()
+    out.write(f"Sampled the event loop thread {samples} times over {elapsed:.1f}s\n")
+    # Samples whose leaf is the selector wait are time the loop was idle
+    idle = sum(n for name, n in own.items() if name.startswith("select ") and "selectors.py" in name)
+    if samples:
+        out.write(f"Idle (waiting for I/O): {idle / samples:.1%}\n")
+    for title, counter in (("Own samples", own), ("Total samples", total)):
+        out.write(f"\n=== {title} ===\n")
+        for name, n in counter.most_common(top):
+            out.write(f"{n:7d} {n / max(samples, 1):7.1%}  {name}\n")
+    shown = min(len(stacks), MAX_COLLAPSED_STACKS)
+    out.write(f"\n=== Top {shown} of {len(stacks)} collapsed stacks ===\n")
+    for stack, n in stacks.most_common(MAX_COLLAPSED_STACKS):
+        out.write(f"{stack} {n}\n")
+    return out.getvalue()
+
+
+async def profile_tracemalloc(seconds: float, top: int) -> str:
+    """Top allocations now and the growth over `seconds`, by source line."""
+    async with _lock:
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        try:
+            before = tracemalloc.take_snapshot()
+            await asyncio.sleep(seconds)
+            after = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+
+    # Skip the tracer's own bookkeeping
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    before = before.filter_traces(filters)
+    after = after.filter_traces(filters)
+
+    out = io.StringIO()
+    out.write(f"tracemalloc over {seconds:.0f}s: {current / 1024 / 1024:.1f} MB traced, peak {peak / 1024 / 1024:.1f} MB\n")
+    if started_tracing:
+        out.write("(tracing was started for this run, so only allocations made during it are seen)\n")
+    out.write(f"\n=== Top {top} allocations by line ===\n")
+    for stat in after.statistics("lineno")[:top]:
+        out.write(f"{stat}\n")
+    out.write(f"\n=== Top {top} changes by line ===\n")
+    for stat in after.compare_to(before, "lineno")[:top]:
+        out.write(f"{stat}\n")
+    out.write(f"\n=== Top {min(top, 10)} allocation tracebacks ===\n")
+    for stat in after.statistics("traceback")[:min(top, 10)]:
+        out.write(f"\n{stat.count} blocks, {stat.size / 1024:.1f} KiB\n")
+        out.write("\n".join(stat.traceback.format()) + "\n")
+    return out.getvalue()
@@ -0,0 +1,100 @@
+import time
+from metrics import Histogram
+
+
+RAID_PULL_TIME = Histogram("raid_pull_seconds", "Time to move a member into a raid channel")
+
+
+class RaidStats:
+    """Counters for a single running raid."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.pulled = 0
+        self.failed = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def record(self, latency: float, ok: bool):
+        if ok:
+            self.pulled += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+        else:
+            self.failed += 1
+
+    def summary(self) -> str:
+        avg = self.total_latency / self.pulled if self.pulled else 0.0
+        minutes = (time.time() - self.started_at) / 60
+        return (
+            f"Pulled {self.pulled} member(s), {self.failed} failed, "
+            f"avg {avg * 1000:.0f} ms / max {self.max_latency * 1000:.0f} ms per pull, "
+            f"running for {minutes:.0f} min"
+        )
+
+
+class RaidRegistry:
+    """Running raids per guild, persisted through the guild config backend.
+
+    `load_all`, `save` and `delete` are the async storage callables to use
+    (DB when configured, otherwise the raid JSON files).
+    """
+
+    def __init__(self, load_all, save, delete):
+        self._load_all = load_all
+        self._save = save
+        self._delete = delete
+        # guild id -> raid state
+        self._raids: dict[int, dict] = {}
+        self._stats: dict[int, RaidStats] = {}
+
+    def __contains__(self, guild_id: int) -> bool:
+        return guild_id in self._raids
+
+    def get(self, guild_id: int) -> dict | None:
+        return self._raids.get(guild_id)
+
+    def stats(self, guild_id: int) -> RaidStats | None:
+        return self._stats.get(guild_id)
+
+    def items(self):
+        return self._raids.items()
+
+    async def restore(self, owns=None) -> list[int]:
+        """Load every persisted raid into memory. Returns the newly restored guild ids.
+
+        `owns(guild_id)` limits this to the guilds served by this process.
+        """
+        restored = []
+        for gid, raid in (await self._load_all()).items():
+            gid = int(gid)
+            if owns is not None and not owns(gid):
+                continue
+            if gid not in self._raids:
+                self._raids[gid] = raid
+                self._stats[gid] = RaidStats()
+                restored.append(gid)
+        return restored
+
+    async def start(self, guild_id: int, raid: dict):
+        await self._save(str(guild_id), raid)
+        self._raids[guild_id] = raid
+        self._stats[guild_id] = RaidStats()
+
+    def discard(self, guild_id: int):
+        """Forget the guild's raid without touching its persisted state."""
+        self._raids.pop(guild_id, None)
+        self._stats.pop(guild_id, None)
+
+    async def stop(self, guild_id: int) -> dict | None:
+        """Forget the guild's raid and delete its persisted state."""
+        raid = self._raids.pop(guild_id, None)
+        self._stats.pop(guild_id, None)
+        await self._delete(str(guild_id))
+        return raid
+
+    def record_pull(self, guild_id: int, latency: float, ok: bool):
+        RAID_PULL_TIME.observe(latency)
+        stats = self._stats.get(guild_id)
+        if stats is not None:
+            stats.record(latency, ok)
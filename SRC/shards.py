@@ -0,0 +1,117 @@
+import os
+import time
+import asyncio
+import discord
+
+
+# Seconds between shard health snapshots written to the shared store
+SHARD_HEALTH_INTERVAL = int(os.environ.get("SHARD_HEALTH_INTERVAL", "30"))
+SHARD_HEALTH_KEY = "shard_health"
+
+
+def process_label() -> str:
+    """Name of this bot process; the launcher sets SHARD_LABEL per process."""
+    return os.environ.get("SHARD_LABEL", "main")
+
+
+def shard_for_guild(guild_id: int, shard_count: int) -> int:
+    return (guild_id >> 22) % shard_count
+
+
+def owns_guild(bot, guild_id: int) -> bool:
+    """True unless the guild belongs to a shard run by another process."""
+    shard_ids = getattr(bot, "shard_ids", None)
+    if not shard_ids or not bot.shard_count:
+        return True
+    return shard_for_guild(guild_id, bot.shard_count) in shard_ids
+
+
+def shard_health(bot, label: str) -> dict:
+    """Snapshot of this process's shards: latency, state and guild count per shard."""
+    guilds_per_shard: dict[int, int] = {}
+    for guild in bot.guilds:
+        guilds_per_shard[guild.shard_id] = guilds_per_shard.get(guild.shard_id, 0) + 1
+
+    shards = {}
+    if isinstance(bot, discord.AutoShardedClient):
+        for shard_id, shard in bot.shards.items():
+            shards[str(shard_id)] = {
+                "latency": None if shard.latency == float("inf") else round(shard.latency, 4),
+                "closed": shard.is_closed(),
+                "ratelimited": shard.is_ws_ratelimited(),
+                "guilds": guilds_per_shard.get(shard_id, 0),
+            }
+    else:
+        shards[str(bot.shard_id or 0)] = {
+            "latency": None if bot.latency == float("inf") else round(bot.latency, 4),
+            "closed": bot.is_closed(),
+            "ratelimited": bot.is_ws_ratelimited(),
+            "guilds": len(bot.guilds),
+        }
+
+    return {
+        "label": label,
+        "pid": os.getpid(),
+        "shard_count": bot.shard_count or 1,
+        "shards": shards,
+        "updated_at": time.time(),
+    }
+
+
+def format_shard_health(health: dict, stale_after: float = SHARD_HEALTH_INTERVAL * 3) -> str:
+    age = time.time() - health.get("updated_at", 0)
+    state = "stale" if age > stale_after else "ok"
+    lines = [f"**{health['label']}** (pid {health['pid']}, {state}, updated {age:.0f}s ago)"]
+    for shard_id, shard in sorted(health["shards"].items(), key=lambda s: int(s[0])):
+        latency = f"{shard['latency'] * 1000:.0f} ms" if shard["latency"] is not None else "n/a"
+        flags = []
+        if shard["closed"]:
+            flags.append("closed")
+        if shard["ratelimited"]:
+            flags.append("ratelimited")
+        lines.append(
+            f"  shard {shard_id}: {latency}, {shard['guilds']} guild(s)"
+            + (f" [{', '.join(flags)}]" if flags else "")
+        )
+    return "\n".join(lines)
+
+
+class ShardMonitor:
+    """Periodically writes this process's shard health to the shared store.
+
+    `save` is the async bot-state save callable, so every launcher process
+    shows up under its own key and /shard_status can list them all.
+    """
+
+    def __init__(self, bot, label: str, save, interval: int = SHARD_HEALTH_INTERVAL):
+        self.bot = bot
+        self.label = label
+        self._save = save
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    @property
+    def key(self) -> str:
+        return f"{SHARD_HEALTH_KEY}.{self.label}"
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    async def report(self) -> dict:
+        health = shard_health(self.bot, self.label)
+        try:
+            await self._save(self.key, health)
+        except Exception as e:
+            print(f"Failed to save shard health for {self.label}:", e)
+        return health
+
+    async def _run(self):
+        await self.bot.wait_until_ready()
+        while not self.bot.is_closed():
+            await self.report()
+            await asyncio.sleep(self.interval)
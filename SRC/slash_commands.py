@@ -4,22 +4,106 @@ from discord.ext import commands
 from discord import app_commands, ForumChannel, CategoryChannel, Interaction
 import discord
 import re
+import io
+import csv
 import json
 import asyncio
+import time
 from pathlib import Path
-from ui import RemoveVerifyView, SetupVerifyView, VerifyUserView, SetupRaidView, RaidStartView
+from ui import RemoveVerifyView, SetupVerifyView, VerifyUserView, SetupRaidView, RaidStartView, ReportPaginatorView
 import os
+import storage
+from bulk import run_bulk, BULK_CONCURRENCY
+from verification import VerificationIndex, edit_member_roles, parse_user_ids
+from gateway import ensure_chunked
+from audit_log import AuditLogSink
+from shards import owns_guild
+from raids import RaidRegistry
+from thread_jobs import ThreadJobRunner
+from forum_sync import (
+    ForumLinks, GuildNameIndex, SyncProgress, apply_forum_cleanup, plan_forum_cleanup, provision_thread,
+    rename_thread_vc, sanitize_name, sync_forum_threads
+)
+
+
+# Single-user /check_verified lookups
+MEMBER_FETCH_CONCURRENCY = 10
+MEMBER_FETCH_TIMEOUT = 5  # seconds per fetch_member call
+MEMBER_FETCH_TTL = 60  # seconds a fetch result is reused
+MEMBER_FETCH_CACHE_SIZE = 5000
 
+HEADER = "**Verification report:**\n\n"
 
-MAX_MESSAGE_LENGTH = 1000
+# Seconds between /sync_forum progress updates
+FORUM_PROGRESS_INTERVAL = 5
 
-HEADER = "**Verification report:**\n\n"
+# /bulk_verify: largest attachment read for user ids, members listed in the log embed
+BULK_VERIFY_MAX_FILE_SIZE = 1024 * 1024
+BULK_VERIFY_LOG_MENTIONS = 40
+
+# Parallel member moves for /move
+MOVE_CONCURRENCY = int(os.environ.get("MOVE_CONCURRENCY", str(BULK_CONCURRENCY)))
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 CONFIG_DIR = BASE_DIR + "/configs"
 TEST_CONFIG_DIR =BASE_DIR + "/test_configs"
 RAIDS_DIR = BASE_DIR+ "/SRC/CurrentRaids"
 
+# Process-wide guild config cache (guild_id -> config). Populated once by
+# load_config() at startup and written through by the save functions so
+# command handlers don't have to hit Postgres / the disk on every call.
+_config_cache: dict[str, dict] = {}
+_config_cache_loaded = False
+_config_cache_loaded_at = 0.0
+CONFIG_CACHE_STATS = {"hits": 0, "misses": 0}
+# Seconds before the all-guilds view is reloaded from storage (0 = never).
+# Launcher processes set this so configs saved by the other processes show
+# up in cross-guild reports.
+CONFIG_CACHE_TTL = float(os.environ.get("CONFIG_CACHE_TTL", "0"))
+
+
+def config_cache_stats() -> dict:
+    """Return a snapshot of the config cache counters."""
+    return {**CONFIG_CACHE_STATS, "size": len(_config_cache), "loaded": _config_cache_loaded}
+
+
+def _config_cache_stale() -> bool:
+    if not _config_cache_loaded:
+        return True
+    return CONFIG_CACHE_TTL > 0 and time.monotonic() - _config_cache_loaded_at > CONFIG_CACHE_TTL
+
+
+def get_cached_configs() -> dict:
+    """Return the cached guild configs, loading them on first use."""
+    if _config_cache_stale():
+        CONFIG_CACHE_STATS["misses"] += 1
+        return load_config()
+    CONFIG_CACHE_STATS["hits"] += 1
+    return _config_cache
+
+
+async def get_cached_configs_async() -> dict:
+    """Like get_cached_configs(), but a cold load runs on the storage pool."""
+    if _config_cache_stale():
+        CONFIG_CACHE_STATS["misses"] += 1
+        _populate_config_cache(await storage.run_io(_read_all_configs, op="load_config"))
+        return _config_cache
+    CONFIG_CACHE_STATS["hits"] += 1
+    return _config_cache
+
+
+def _get_db():
+    """Return the db module, or None when it can't be imported."""
+    try:
+        import db as _db
+    except Exception:
+        try:
+            from . import db as _db
+        except Exception:
+            # fallback to filesystem if DB import fails
+            _db = None
+    return _db
+
 
 def get_config_dir() -> str:
     val = os.environ.get("VC_CONTROL_TESTING", "0")
@@ -32,6 +116,17 @@ def ensure_configs_dir():
     os.makedirs(get_config_dir(), exist_ok=True)
 
 
+# Raid state, forum link and thread job files are "<guild id>_<kind>.json"; bot
+# state keys never start with a digit. Matching the whole name keeps guilds whose
+# name merely ends in "raid" or "forum" from losing their config.
+_STATE_FILE = re.compile(r"^(?:\d+_(?:raid|forum|threads)|\D[^/]*_bot_state)\.json$")
+
+
+def _is_state_file(fname: str) -> bool:
+    """Raid state, forum link, thread job and bot state files live next to the guild configs."""
+    return _STATE_FILE.match(fname) is not None
+
+
 def get_guild_filename(guild_id: str, guild_name: str) -> str:
     safe_name = sanitize_name(guild_name).replace(" ", "_") if guild_name else ""
     return f"{guild_id}_{safe_name}.json" if safe_name else f"{guild_id}.json"
@@ -42,17 +137,24 @@ def load_config():
 
         Load per-server JSON files from the config directory.
         Returns a dict mapping guild_id (as string) -> config object.
+        The result also (re)populates the process-wide config cache.
     """
+    _populate_config_cache(_read_all_configs())
+    return _config_cache
+
+
+def _populate_config_cache(configs: dict):
+    global _config_cache_loaded, _config_cache_loaded_at
+    _config_cache.clear()
+    _config_cache.update({str(gid): cfg for gid, cfg in configs.items()})
+    _config_cache_loaded = True
+    _config_cache_loaded_at = time.monotonic()
+
+
+def _read_all_configs() -> dict:
     # Prefer DB-backed configs when DATABASE_URL is set
     if os.environ.get("DATABASE_URL"):
-        try:
-            import db as _db
-        except Exception:
-            try:
-                from . import db as _db
-            except Exception:
-                # fallback to filesystem if DB import fails
-                _db = None
+        _db = _get_db()
 
         if _db:
             try:
@@ -64,7 +166,7 @@ def load_config():
     configs = {}
 
     for fname in os.listdir(get_config_dir()):
-        if not fname.lower().endswith(".json"):
+        if not fname.lower().endswith(".json") or _is_state_file(fname):
             continue
         path = os.path.join(get_config_dir(), fname)
         try:
@@ -86,15 +188,23 @@ def load_config():
 
 def load_guild_config(guild_id: str, guild_name: str | None = None):
     """Load a single guild config. Returns the config dict or None if missing."""
+    gid = str(guild_id)
+    cfg = _config_cache.get(gid)
+    if cfg is not None:
+        CONFIG_CACHE_STATS["hits"] += 1
+        return cfg
+
+    CONFIG_CACHE_STATS["misses"] += 1
+    cfg = _read_guild_config(gid, guild_name)
+    if cfg is not None:
+        _config_cache[gid] = cfg
+    return cfg
+
+
+def _read_guild_config(guild_id: str, guild_name: str | None = None):
     # Try DB first when available
     if os.environ.get("DATABASE_URL"):
-        try:
-            import db as _db
-        except Exception:
-            try:
-                from . import db as _db
-            except Exception:
-                _db = None
+        _db = _get_db()
 
         if _db:
             try:
@@ -104,6 +214,10 @@ def load_guild_config(guild_id: str, guild_name: str | None = None):
             except Exception as e:
                 print("DB load_guild_config failed:", e)
 
+    return _read_guild_config_file(guild_id, guild_name)
+
+
+def _read_guild_config_file(guild_id: str, guild_name: str | None = None):
     ensure_configs_dir()
     gid = str(guild_id)
 
@@ -120,7 +234,7 @@ def load_guild_config(guild_id: str, guild_name: str | None = None):
 
     # Fallback: find any file starting with the guild id
     for fname in os.listdir(get_config_dir()):
-        if not fname.lower().endswith(".json"):
+        if not fname.lower().endswith(".json") or _is_state_file(fname):
             continue
         if fname.startswith(gid):
             try:
@@ -133,15 +247,14 @@ def load_guild_config(guild_id: str, guild_name: str | None = None):
 
 def save_guild_config(guild_id: str, cfg: dict):
     """Save a single guild config to its JSON file."""
+    _write_guild_config(guild_id, cfg)
+    _config_cache[str(guild_id)] = cfg
+
+
+def _write_guild_config(guild_id: str, cfg: dict):
     # Prefer DB when DATABASE_URL provided
     if os.environ.get("DATABASE_URL"):
-        try:
-            import db as _db
-        except Exception:
-            try:
-                from . import db as _db
-            except Exception:
-                _db = None
+        _db = _get_db()
 
         if _db:
             try:
@@ -150,6 +263,10 @@ def save_guild_config(guild_id: str, cfg: dict):
             except Exception as e:
                 print("DB save_guild_config failed:", e)
 
+    _write_guild_config_file(guild_id, cfg)
+
+
+def _write_guild_config_file(guild_id: str, cfg: dict):
     ensure_configs_dir()
     gid = str(guild_id)
     guild_name = cfg.get("name", "") if isinstance(cfg, dict) else ""
@@ -170,6 +287,117 @@ def save_raid_config(guild_id: str, cfg: dict):
     with open(path, "w", encoding="utf-8") as f:
         json.dump(cfg, f, indent=4)
 
+
+def get_raid_config_path(guild_id: str) -> str:
+    return os.path.join(get_config_dir(), f"{guild_id}_raid.json")
+
+
+def load_raid_configs() -> dict:
+    """Load every raid state file. Returns a dict mapping guild_id -> raid state."""
+    ensure_configs_dir()
+    raids = {}
+    for fname in os.listdir(get_config_dir()):
+        m = re.match(r"(\d+)_raid\.json$", fname)
+        if not m:
+            continue
+        try:
+            with open(os.path.join(get_config_dir(), fname), "r", encoding="utf-8") as f:
+                raids[m.group(1)] = json.load(f)
+        except Exception as e:
+            print(e)
+    return raids
+
+
+def delete_raid_config(guild_id: str):
+    path = get_raid_config_path(guild_id)
+    if os.path.exists(path):
+        os.remove(path)
+
+def load_forum_links(guild_id: str) -> dict | None:
+    path = os.path.join(get_config_dir(), f"{guild_id}_forum.json")
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(e)
+        return None
+
+
+def save_forum_links(guild_id: str, links: dict):
+    ensure_configs_dir()
+    with open(os.path.join(get_config_dir(), f"{guild_id}_forum.json"), "w", encoding="utf-8") as f:
+        json.dump(links, f, indent=4)
+
+def load_thread_jobs() -> dict:
+    """Load every thread job file. Returns a dict mapping guild_id -> {job id: job}."""
+    ensure_configs_dir()
+    jobs = {}
+    for fname in os.listdir(get_config_dir()):
+        m = re.match(r"(\d+)_threads\.json$", fname)
+        if not m:
+            continue
+        try:
+            with open(os.path.join(get_config_dir(), fname), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            print(e)
+            continue
+        if data:
+            jobs[m.group(1)] = data
+    return jobs
+
+
+def save_thread_jobs(guild_id: str, jobs: dict):
+    ensure_configs_dir()
+    path = os.path.join(get_config_dir(), f"{guild_id}_threads.json")
+    if not jobs:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(jobs, f, indent=4)
+
+def get_bot_state_path(key: str) -> str:
+    # One file per key, so launcher processes sharing the config dir never
+    # rewrite each other's state
+    safe_key = re.sub(r"[^\w.-]", "_", key)
+    return os.path.join(get_config_dir(), f"{safe_key}_bot_state.json")
+
+
+def load_bot_state(key: str) -> dict | None:
+    path = get_bot_state_path(key)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(e)
+        return None
+
+
+def load_bot_states(prefix: str) -> dict:
+    """Load every bot state whose key starts with `prefix`. Returns key -> data."""
+    ensure_configs_dir()
+    states = {}
+    for fname in os.listdir(get_config_dir()):
+        if not fname.endswith("_bot_state.json") or not fname.startswith(prefix):
+            continue
+        key = fname[:-len("_bot_state.json")]
+        data = load_bot_state(key)
+        if data is not None:
+            states[key] = data
+    return states
+
+
+def save_bot_state(key: str, data: dict):
+    ensure_configs_dir()
+    with open(get_bot_state_path(key), "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4)
+
+
 def save_config(config):
     """Save the provided config mapping to per-server files in `configs/`.
 
@@ -177,15 +405,14 @@ def save_config(config):
     Each guild's config is written to a separate JSON file named
     `<guild_id>_<sanitized_guild_name>.json` (or `<guild_id>.json` when name missing).
     """
+    _write_config(config)
+    _config_cache.update({str(gid): cfg for gid, cfg in config.items()})
+
+
+def _write_config(config):
     # Prefer DB when DATABASE_URL provided
     if os.environ.get("DATABASE_URL"):
-        try:
-            import db as _db
-        except Exception:
-            try:
-                from . import db as _db
-            except Exception:
-                _db = None
+        _db = _get_db()
 
         if _db:
             try:
@@ -210,37 +437,419 @@ def save_config(config):
             # if writing fails, skip (don't crash the whole save)
             continue
 
-def sanitize_name(name: str) -> str:
-    return re.sub(r"[^\w\s-]", "", name)[:90]
 
-async def ensure_vc_for_thread(guild, thread, category):
-    title = sanitize_name(thread.name)
+async def load_guild_config_async(guild_id: str, guild_name: str | None = None):
+    """Awaitable load_guild_config() for use inside commands and listeners.
 
-    # Get or create role
-    role = discord.utils.get(guild.roles, name=title)
-    if role is None:
-        role = await guild.create_role(name=title)
+    Served from the config cache; storage is only touched on a miss and DB
+    queries run on the db module's executor instead of the event loop.
+    """
+    gid = str(guild_id)
+    cfg = _config_cache.get(gid)
+    if cfg is not None:
+        CONFIG_CACHE_STATS["hits"] += 1
+        return cfg
+
+    CONFIG_CACHE_STATS["misses"] += 1
+    cfg = None
+    _db = _get_db() if os.environ.get("DATABASE_URL") else None
+    if _db:
+        try:
+            cfg = await _db.load_guild_config_async(gid)
+        except Exception as e:
+            print("DB load_guild_config failed:", e)
 
-    # Check if VC already exists in the category
-    if discord.utils.get(category.voice_channels, name=title):
-        return False
+    if cfg is None:
+        cfg = await storage.run_io(_read_guild_config_file, gid, guild_name, op="load_guild_config")
+    if cfg is not None:
+        _config_cache[gid] = cfg
+    return cfg
 
-    overwrites = {
-        guild.default_role: discord.PermissionOverwrite(view_channel=False),
-        role: discord.PermissionOverwrite(view_channel=True, connect=True, speak=True)
-    }
 
-    await guild.create_voice_channel(
-        name=title,
-        category=category,
-        overwrites=overwrites
-    )
-    return True
+async def load_raid_configs_async() -> dict:
+    """Load every running raid from the DB, or from the raid files."""
+    _db = _get_db() if os.environ.get("DATABASE_URL") else None
+    if _db:
+        try:
+            return await _db.load_all_raids_async()
+        except Exception as e:
+            print("DB load_all_raids failed:", e)
+    return await storage.run_io(load_raid_configs, op="load_raid_configs")
+
+
+async def save_raid_config_async(guild_id: str, raid: dict):
+    _db = _get_db() if os.environ.get("DATABASE_URL") else None
+    if _db:
+        try:
+            await _db.save_raid_async(str(guild_id), raid)
+            return
+        except Exception as e:
+            print("DB save_raid failed:", e)
+    await storage.run_io(save_raid_config, str(guild_id), raid, op="save_raid_config")
+
+
+async def delete_raid_config_async(guild_id: str):
+    _db = _get_db() if os.environ.get("DATABASE_URL") else None
+    if _db:
+        try:
+            await _db.delete_raid_async(str(guild_id))
+        except Exception as e:
+            print("DB delete_raid failed:", e)
+    # Also drop any file left over from before the DB was configured
+    await storage.run_io(delete_raid_config, str(guild_id), op="delete_raid_config")
+
+
+async def load_forum_links_async(guild_id: str) -> dict | None:
+    """Load a guild's forum post -> role/VC links from the DB, or its links file."""
+    _db = _get_db() if os.environ.get("DATABASE_URL") else None
+    if _db:
+        try:
+            return await _db.load_forum_links_async(str(guild_id))
+        except Exception as e:
+            print("DB load_forum_links failed:", e)
+    return await storage.run_io(load_forum_links, str(guild_id), op="load_forum_links")
+
+
+async def save_forum_links_async(guild_id: str, links: dict):
+    _db = _get_db() if os.environ.get("DATABASE_URL") else None
+    if _db:
+        try:
+            await _db.save_forum_links_async(str(guild_id), links)
+            return
+        except Exception as e:
+            print("DB save_forum_links failed:", e)
+    await storage.run_io(save_forum_links, str(guild_id), links, op="save_forum_links")
+
+
+async def load_thread_jobs_async() -> dict:
+    """Load every unfinished /create_threads job from the DB, or from the job files."""
+    _db = _get_db() if os.environ.get("DATABASE_URL") else None
+    if _db:
+        try:
+            return await _db.load_all_thread_jobs_async()
+        except Exception as e:
+            print("DB load_all_thread_jobs failed:", e)
+    return await storage.run_io(load_thread_jobs, op="load_thread_jobs")
+
+
+async def save_thread_jobs_async(guild_id: str, jobs: dict):
+    _db = _get_db() if os.environ.get("DATABASE_URL") else None
+    if _db:
+        try:
+            await _db.save_thread_jobs_async(str(guild_id), jobs)
+            return
+        except Exception as e:
+            print("DB save_thread_jobs failed:", e)
+    await storage.run_io(save_thread_jobs, str(guild_id), jobs, op="save_thread_jobs")
+
+
+async def load_bot_state_async(key: str) -> dict | None:
+    """Load bot-wide state (e.g. command tree hashes) from the DB, or from the state file."""
+    _db = _get_db() if os.environ.get("DATABASE_URL") else None
+    if _db:
+        try:
+            return await _db.load_bot_state_async(key)
+        except Exception as e:
+            print("DB load_bot_state failed:", e)
+    return await storage.run_io(load_bot_state, key, op="load_bot_state")
+
+
+async def load_bot_states_async(prefix: str) -> dict:
+    _db = _get_db() if os.environ.get("DATABASE_URL") else None
+    if _db:
+        try:
+            return await _db.load_bot_states_async(prefix)
+        except Exception as e:
+            print("DB load_bot_states failed:", e)
+    return await storage.run_io(load_bot_states, prefix, op="load_bot_states")
+
+
+async def save_bot_state_async(key: str, data: dict):
+    _db = _get_db() if os.environ.get("DATABASE_URL") else None
+    if _db:
+        try:
+            await _db.save_bot_state_async(key, data)
+            return
+        except Exception as e:
+            print("DB save_bot_state failed:", e)
+    await storage.run_io(save_bot_state, key, data, op="save_bot_state")
+
+
+async def save_guild_config_async(guild_id: str, cfg: dict):
+    """Awaitable save_guild_config(); writes through to the config cache."""
+    _db = _get_db() if os.environ.get("DATABASE_URL") else None
+    saved = False
+    if _db:
+        try:
+            await _db.save_guild_config_async(str(guild_id), cfg)
+            saved = True
+        except Exception as e:
+            print("DB save_guild_config failed:", e)
+
+    if not saved:
+        await storage.run_io(_write_guild_config_file, guild_id, cfg, op="save_guild_config")
+    _config_cache[str(guild_id)] = cfg
 
 
 class VCSlashCommands(commands.Cog):
+    # Gateway intents these commands and listeners rely on (see gateway.build_intents)
+    REQUIRED_INTENTS = ("guilds", "members", "voice_states")
+
     def __init__(self, bot):
         self.bot = bot
+        self.verification_index = VerificationIndex()
+        self.forum_links = ForumLinks(load=load_forum_links_async, save=save_forum_links_async)
+        self.thread_jobs = ThreadJobRunner(bot, load_all=load_thread_jobs_async, save=save_thread_jobs_async)
+        self.raids = RaidRegistry(
+            load_all=load_raid_configs_async,
+            save=save_raid_config_async,
+            delete=delete_raid_config_async
+        )
+        # guild id -> name index shared by the forum commands and listeners
+        self._name_indexes: dict[int, GuildNameIndex] = {}
+        # (guild id, user id) -> (expires at, member or None)
+        self._member_fetch_cache: dict[tuple[int, int], tuple[float, discord.Member | None]] = {}
+        self.audit_log = AuditLogSink(bot)
+
+    async def cog_load(self):
+        self.audit_log.start()
+        # When the cog is (re)added after the bot is ready, on_ready won't fire for it
+        if self.bot.is_ready():
+            await self._build_verification_index()
+            await self._resume_raids()
+            await self._resume_thread_jobs()
+
+    async def cog_unload(self):
+        # Bot.close() removes the cogs, so thread job progress and queued log
+        # embeds are saved / flushed on shutdown
+        await self.thread_jobs.close()
+        await self.audit_log.close()
+
+    async def _build_verification_index(self):
+        configs = await get_cached_configs_async()
+        self.verification_index.rebuild(self.bot, configs)
+        print(f"Verification index built: {len(self.verification_index)} verified user(s)")
+
+    async def _ensure_indexed(self, guild_ids):
+        """Chunk and index configured guilds the verification index hasn't seen yet."""
+        configs = await get_cached_configs_async()
+
+        async def index(guild):
+            await ensure_chunked(guild)
+            self.verification_index.index_guild(guild, configs.get(str(guild.id)))
+
+        guilds = [self.bot.get_guild(int(gid)) for gid in guild_ids]
+        await asyncio.gather(*(
+            index(guild) for guild in guilds
+            if guild is not None and not self.verification_index.is_indexed(guild.id)
+        ))
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        await self._build_verification_index()
+        await self._resume_raids()
+        await self._resume_thread_jobs()
+
+    def _owns_guild(self, guild_id: int) -> bool:
+        return owns_guild(self.bot, guild_id)
+
+    async def _resume_thread_jobs(self):
+        resumed = await self.thread_jobs.resume(owns=self._owns_guild)
+        if resumed:
+            print(f"Resumed {resumed} thread job(s)")
+
+    async def _resume_raids(self):
+        """Pick up raids that were running before a restart."""
+        for gid in await self.raids.restore(owns=self._owns_guild):
+            raid = self.raids.get(gid)
+            if "Raid Channel" not in raid or "Raid roles" not in raid:
+                # Raids saved by older versions don't carry the raid setup;
+                # take it from the guild config
+                guild_cfg = await load_guild_config_async(str(gid), raid.get("name")) or {}
+                if "Raid Channel" not in guild_cfg or "Raid roles" not in guild_cfg:
+                    print(f"Skipping saved raid for guild {gid}: raid channel and roles aren't configured")
+                    self.raids.discard(gid)
+                    continue
+                raid.setdefault("Raid Channel", guild_cfg["Raid Channel"])
+                raid.setdefault("Raid roles", guild_cfg["Raid roles"])
+            guild = self.bot.get_guild(gid)
+            if guild is None:
+                continue
+            waiting = [m for cid in raid["channels"] for m in getattr(guild.get_channel(cid), "members", [])]
+            await self._pull_into_raid(guild, raid, waiting)
+            print(f"Resumed raid in {guild.name}")
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        if before.roles != after.roles:
+            self.verification_index.update_member(after)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        self.verification_index.update_member(member)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        self.verification_index.remove_member(member.guild.id, member.id)
+
+    async def _fetch_member_cached(self, guild: discord.Guild, user_id: int, semaphore: asyncio.Semaphore):
+        """fetch_member() with a per-request timeout and a short-lived result cache.
+
+        Returns the member, or None if the user isn't in the guild.
+        """
+        key = (guild.id, user_id)
+        now = time.monotonic()
+        cached = self._member_fetch_cache.get(key)
+        if cached and cached[0] > now:
+            return cached[1]
+
+        member = await self._fetch_member(guild, user_id, semaphore)
+        if len(self._member_fetch_cache) > MEMBER_FETCH_CACHE_SIZE:
+            self._member_fetch_cache = {k: v for k, v in self._member_fetch_cache.items() if v[0] > now}
+        self._member_fetch_cache[key] = (now + MEMBER_FETCH_TTL, member)
+        return member
+
+    @staticmethod
+    async def _fetch_member(guild: discord.Guild, user_id: int, semaphore: asyncio.Semaphore):
+        """fetch_member() with a per-request timeout; None if the user isn't in the guild."""
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(guild.fetch_member(user_id), MEMBER_FETCH_TIMEOUT)
+            except discord.NotFound:
+                return None
+
+    async def _fetch_remote_member_roles(self, guild_id: int, user_id: int, semaphore: asyncio.Semaphore):
+        """Role ids of a member in a guild served by another launcher process.
+
+        Goes straight to the REST API since that guild isn't in our cache.
+        Returns None if the user isn't in the guild.
+        """
+        async with semaphore:
+            try:
+                data = await asyncio.wait_for(self.bot.http.get_member(guild_id, user_id), MEMBER_FETCH_TIMEOUT)
+            except discord.NotFound:
+                return None
+        return {int(r) for r in data.get("roles", [])}
+
+    @commands.Cog.listener()
+    async def on_thread_create(self, thread: discord.Thread):
+        # Give new posts in a synced forum their role and VC right away
+        if not isinstance(thread.parent, ForumChannel):
+            return
+        links = await self.forum_links.get(thread.guild.id)
+        forum_link = links["forums"].get(str(thread.parent_id))
+        if forum_link is None:
+            return
+        category = thread.guild.get_channel(forum_link["category"])
+        if not isinstance(category, CategoryChannel):
+            return
+        try:
+            result = await provision_thread(thread.guild, thread, category, self._name_index(thread.guild), links)
+        except discord.HTTPException as e:
+            print(f"Failed to provision VC for forum post {thread.name}: {e}")
+            return
+        if result != "unchanged":
+            await self.forum_links.save(thread.guild.id)
+
+    @commands.Cog.listener()
+    async def on_thread_update(self, before: discord.Thread, after: discord.Thread):
+        if before.name == after.name:
+            return
+        links = await self.forum_links.get(after.guild.id)
+        link = links["threads"].get(str(after.id))
+        title = sanitize_name(after.name)
+        if link is None or link["name"] == title:
+            return
+        role = after.guild.get_role(link["role"])
+        channel = after.guild.get_channel(link["vc"])
+        if role is None or channel is None:
+            return
+        try:
+            await rename_thread_vc(role, channel, title)
+        except discord.HTTPException as e:
+            print(f"Failed to rename VC for forum post {after.name}: {e}")
+            return
+        link["name"] = title
+        await self.forum_links.save(after.guild.id)
+
+    def _name_index(self, guild: discord.Guild) -> GuildNameIndex:
+        index = self._name_indexes.get(guild.id)
+        if index is None:
+            index = self._name_indexes[guild.id] = GuildNameIndex(guild)
+        return index
+
+    # Keep the shared name indexes in step with the guild
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self._name_indexes.pop(guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role):
+        index = self._name_indexes.get(role.guild.id)
+        if index:
+            index.add_role(role)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        index = self._name_indexes.get(role.guild.id)
+        if index:
+            index.remove_role(role)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        index = self._name_indexes.get(after.guild.id)
+        if index and before.name != after.name:
+            index.remove_role(before)
+            index.add_role(after)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        index = self._name_indexes.get(channel.guild.id)
+        if index and isinstance(channel, discord.VoiceChannel):
+            index.add_voice_channel(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        index = self._name_indexes.get(channel.guild.id)
+        if index and isinstance(channel, discord.VoiceChannel):
+            index.remove_voice_channel(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        index = self._name_indexes.get(after.guild.id)
+        if index and isinstance(after, discord.VoiceChannel) and (
+                before.name != after.name or before.category_id != after.category_id):
+            index.remove_voice_channel(before)
+            index.add_voice_channel(after)
+
+    @staticmethod
+    def _verification_report_file(rows) -> discord.File:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(["user_id", "user", "verified_in", "not_verified_in", "not_in_server"])
+        for member, verified_in, not_verified_in, not_in_server in rows:
+            writer.writerow([
+                member.id,
+                str(member),
+                "; ".join(verified_in),
+                "; ".join(not_verified_in),
+                "; ".join(not_in_server),
+            ])
+        data = io.BytesIO(buffer.getvalue().encode("utf-8"))
+        return discord.File(data, filename="verification_report.csv")
+
+    @staticmethod
+    def _verification_line(member, verified_in, not_verified_in, not_in_server) -> str:
+        parts = []
+        if verified_in:
+            parts.append("✅ " + ", ".join(verified_in))
+        if not_verified_in:
+            parts.append("❌ " + ", ".join(not_verified_in))
+        if not_in_server:
+            parts.append("⚠️ " + ", ".join(not_in_server))
+        return f"{member.mention}: " + " | ".join(parts)
+
     # -----------------------------
     # /move
     # -----------------------------
@@ -326,23 +935,19 @@ class VCSlashCommands(commands.Cog):
             )
             return
 
-        # Move the members
-        moved_count = 0
-        failed_count = 0
-
-        for member in members_to_move:
-            try:
-                await member.move_to(destination_c)
-                moved_count += 1
-            except discord.Forbidden:
-                failed_count += 1
-            except discord.HTTPException:
-                failed_count += 1
+        # Move the members concurrently
+        result = await run_bulk(
+            members_to_move,
+            lambda member: member.move_to(destination_c),
+            concurrency=MOVE_CONCURRENCY
+        )
 
         # Send success message
-        result_msg = f"✅ Moved {moved_count} member(s) from {source_c.mention} to {destination_c.mention}"
-        if failed_count > 0:
-            result_msg += f"\n⚠️ Failed to move {failed_count} member(s) (missing permissions)"
+        result_msg = f"✅ Moved {result.succeeded} member(s) from {source_c.mention} to {destination_c.mention} in {result.elapsed:.1f}s"
+        if result.retried > 0:
+            result_msg += f"\n🔁 Retried {result.retried} move(s)"
+        if result.failed > 0:
+            result_msg += f"\n⚠️ Failed to move {result.failed} member(s) (missing permissions or API error)"
 
         await interaction.followup.send(result_msg, ephemeral=True)
 
@@ -356,7 +961,8 @@ class VCSlashCommands(commands.Cog):
     @app_commands.describe(
         forum="Select the forum channel to sync",
         category="Select the category where VCs will be created",
-        sync_roles="Do you want the bot to auto assign roles? Default is False"
+        sync_roles="Do you want the bot to auto assign roles? Default is False",
+        dry_run="Only show what would be created or renamed"
     )
     @app_commands.default_permissions(manage_channels=True, manage_roles=True)
     async def sync_forum(
@@ -364,32 +970,64 @@ class VCSlashCommands(commands.Cog):
         interaction: Interaction,
         forum: ForumChannel,
         category: CategoryChannel,
-        sync_roles: bool = False
+        sync_roles: bool = False,
+        dry_run: bool = False
     ):
         await interaction.response.defer(ephemeral=True)
         guild = interaction.guild
-        created = 0
-
-        # Active threads
-        for thread in forum.threads:
-            if await ensure_vc_for_thread(guild, thread, category):
-                created += 1
-
-        # Archived threads
-        async for thread in forum.archived_threads(limit=None):
-            if await ensure_vc_for_thread(guild, thread, category):
-                created += 1
+        index = self._name_index(guild)
+        progress = SyncProgress()
+        links = await self.forum_links.get(guild.id)
+
+        # Active and archived posts go through the role/VC creation pipeline;
+        # posts that are already linked and unchanged are skipped
+        sync = asyncio.create_task(
+            sync_forum_threads(guild, forum, category, index, links, progress, dry_run=dry_run)
+        )
+        while not sync.done():
+            await asyncio.wait({sync}, timeout=FORUM_PROGRESS_INTERVAL)
+            if not sync.done():
+                try:
+                    await interaction.edit_original_response(content=f"⏳ {progress.summary()}")
+                except discord.HTTPException:
+                    pass
+        try:
+            sync.result()
+        except Exception as e:
+            # e.g. Forbidden listing archived posts; keep whatever got linked
+            print(f"Forum sync of {forum.name} in {guild.name} failed:")
+            import traceback
+            traceback.print_exception(e)
+            if not dry_run:
+                await self.forum_links.save(guild.id)
+            await interaction.followup.send(
+                f"❌ Sync failed: {e}\n{progress.summary()}",
+                ephemeral=True
+            )
+            return
+        if dry_run:
+            await self._send_plan(interaction, f"Sync plan for {forum.name}", progress.plan,
+                                  f"{progress.skipped} post(s) unchanged")
+            return
+        await self.forum_links.save(guild.id)
 
         await interaction.followup.send(
-            f"Sync complete. Created **{created}** voice channels in {category.name}.",
+            f"Sync complete. Created **{progress.created}** voice channels in {category.name}.\n{progress.summary()}",
             ephemeral=True
         )
         if sync_roles:
+            # Resolve members once per run instead of paging the member list per thread
+            if guild.chunked:
+                members_by_id = {m.id: m for m in guild.members}
+            else:
+                members_by_id = {m.id: m async for m in guild.fetch_members(limit=None)}
+
             for thread in forum.threads:
                 title = sanitize_name(thread.name)
 
-                # Get the role matching the thread title
-                role = discord.utils.get(guild.roles, name=title)
+                # The stored link knows the post's role even when its name differs from the title
+                link = links["threads"].get(str(thread.id))
+                role = (guild.get_role(link["role"]) if link else None) or index.role(title)
                 print(role)
                 if role is None:
                     await interaction.followup.send(
@@ -399,26 +1037,19 @@ class VCSlashCommands(commands.Cog):
                     continue
 
                 assigned = set()
-                members=[]
-                temp_members=guild.fetch_members()
-                async for mem in temp_members:
-                    members.append(mem)
-                # Scan messages in the thread
-                member=None
-                first_msg = await thread.fetch_message(thread.id)
+                # Scan the post's starter message for mentions
+                first_msg = thread.starter_message or await thread.fetch_message(thread.id)
                 for user in first_msg.mentions:
-                        if user is not None:
-                            for m in members:
-                                if m.name == user.name:
-                                    member=m
-                                    print(member)
-                                    try:
-                                        await member.add_roles(role)
-                                        assigned.add(member.display_name)
-                                    except discord.Forbidden:
-                                        print(f"Cannot assign {role} to {member}")
-                                    except Exception as e:
-                                        print(e)
+                    member = members_by_id.get(user.id)
+                    if member is None or role in member.roles:
+                        continue
+                    try:
+                        await member.add_roles(role)
+                        assigned.add(member.display_name)
+                    except discord.Forbidden:
+                        print(f"Cannot assign {role} to {member}")
+                    except Exception as e:
+                        print(e)
 
                 await interaction.followup.send(
                     f"VC access granted to: {', '.join(assigned) if assigned else 'No new users.'}",
@@ -433,52 +1064,46 @@ class VCSlashCommands(commands.Cog):
         description="Delete VC channels, roles and clear forum threads"
     )
     @app_commands.describe(
-        forum="select the forum channel to clear"
+        forum="select the forum channel to clear",
+        dry_run="Only show what would be deleted"
     )
     @app_commands.default_permissions(manage_channels=True, manage_roles=True)
-    async def cleanup_forum(self, interaction: discord.Interaction, forum: discord.ForumChannel):
+    async def cleanup_forum(self, interaction: discord.Interaction, forum: discord.ForumChannel, dry_run: bool = False):
         await interaction.response.defer(ephemeral=True)
         guild = interaction.guild
-        deleted_roles = []
-        deleted_channels = []
+        links = await self.forum_links.get(guild.id)
+        actions = plan_forum_cleanup(guild, forum.threads, self._name_index(guild), links)
 
-        for thread in forum.threads:
-            role_name = sanitize_name(thread.name)
-            role = discord.utils.get(guild.roles, name=role_name)
-            if role:
-                try:
-                    await role.delete(reason="Cleanup VC Roles")
-                    deleted_roles.append(role_name)
-                except discord.Forbidden:
-                    print(f"Cannot delete role {role_name} - check bot permissions")
-                except discord.NotFound:
-                    print(f"Cannot delete role {role_name} - role not found")
-
-            vc_channel = discord.utils.get(guild.voice_channels, name=role_name)
-            if vc_channel:
-                try:
-                    await vc_channel.delete(reason="Cleanup VC channels")
-                    deleted_channels.append(vc_channel.name)
-                except discord.Forbidden:
-                    print(f"Cannot delete channel {vc_channel.name} - check bot permissions")
-                except discord.NotFound:
-                    print(f"Cannot delete channel {vc_channel.name} - channel not found")
+        if dry_run:
+            await self._send_plan(interaction, f"Cleanup plan for {forum.name}", actions)
+            return
 
-            try:
-                await thread.delete(reason="Cleanup forum threads")
-            except discord.Forbidden:
-                    print(f"Cannot delete thread {thread.name} - check bot permissions")
-            except discord.NotFound:
-                    print(f"Cannot delete thread {thread.name} - thread not found")
+        # All deletes go out together, bounded by FORUM_SYNC_WORKERS
+        result = await apply_forum_cleanup(actions)
+        failed = {id(action) for action, _ in result.errors}
+        for action, error in result.errors:
+            print(f"Cannot delete {action.detail} {action.name} - {error}")
+        deleted_roles = [a.name for a in actions if a.detail == "role" and id(a) not in failed]
+        deleted_channels = [a.name for a in actions if a.detail == "VC" and id(a) not in failed]
+
+        await self.forum_links.forget_forum(guild.id, forum.id)
 
         await interaction.followup.send(
             f"Deleted VC channels: {', '.join(deleted_channels) if deleted_channels else 'None'}\n"
             f"Deleted roles: {', '.join(deleted_roles) if deleted_roles else 'None'}\n"
-            f"Cleared all forum threads",
+            f"Cleared all forum threads"
+            + (f"\n⚠️ {result.failed} deletion(s) failed (check bot permissions)" if result.failed else ""),
             ephemeral=True
         )
         print(f"Cleanup command used by {interaction.user.display_name} in {interaction.guild.name} server. Deleted channels: {deleted_channels}, Deleted roles: {deleted_roles}")
 
+    async def _send_plan(self, interaction: discord.Interaction, title: str, actions, footer: str = ""):
+        lines = [action.describe() for action in actions] or ["Nothing to do."]
+        if footer:
+            lines.append(footer)
+        view = ReportPaginatorView(invoker=interaction.user, title=f"{title} (dry run)", lines=lines)
+        await interaction.followup.send(embed=view.render(), view=view, ephemeral=True)
+
     # ------------------------------
     # Check verified command
     # ------------------------------
@@ -488,17 +1113,19 @@ class VCSlashCommands(commands.Cog):
     )
     @app_commands.describe(
         user="Select the user",
-        verified_only ="Do you want only the people that are verified in more than one server?"
+        verified_only ="Do you want only the people that are verified in more than one server?",
+        as_file="Attach the full report as a CSV file instead of showing pages"
     )
     @app_commands.default_permissions(administrator=True)
     async def check_verified(self,
                              interaction: discord.Interaction,
                              user: discord.User = None,
-                             verified_only: bool = True
+                             verified_only: bool = True,
+                             as_file: bool = False
     ):
         await interaction.response.defer(ephemeral=True)
 
-        config = load_config()
+        config = await get_cached_configs_async()
         guild_id = str(interaction.guild.id)
         guild_cfg = config.get(guild_id)
         if not guild_cfg:
@@ -508,88 +1135,115 @@ class VCSlashCommands(commands.Cog):
             )
             return
 
-        origin_guild_members = [user] if user else interaction.guild.members
-
-        # Ignore bots
-        origin_guild_members = [m for m in origin_guild_members if not m.bot]
-
+        if not user:
+            # Bulk mode reads member lists and the index, so every configured guild must be cached
+            await ensure_chunked(interaction.guild)
+            await self._ensure_indexed(config.keys())
         members_to_check = [user] if user else [m for m in interaction.guild.members if not m.bot]
 
-        all_lines = []
-
-        for member in members_to_check:
-            verified_in = []
-            not_verified_in = []
-            not_in_server = []
+        # (member, verified_in, not_verified_in, not_in_server) per reported member
+        rows = []
+
+        if user:
+            semaphore = asyncio.Semaphore(MEMBER_FETCH_CONCURRENCY)
+            # config is the live cache, which a TTL reload may replace while we
+            # await the lookups; pair every result against one snapshot
+            config_items = list(config.items())
+            for member in members_to_check:
+                verified_in = []
+                not_verified_in = []
+                not_in_server = []
+
+                guilds = [(cfg, self.bot.get_guild(int(cfg_guild_id))) for cfg_guild_id, cfg in config_items]
+                # Guilds on shards run by another process are looked up over REST
+                remote = [
+                    int(cfg_guild_id) for (cfg_guild_id, _), (_, guild) in zip(config_items, guilds)
+                    if not guild and not self._owns_guild(int(cfg_guild_id))
+                ]
+                # Fetch the member from every guild at once rather than one guild at a time
+                results = await asyncio.gather(
+                    *(self._fetch_member_cached(guild, member.id, semaphore) for _, guild in guilds if guild),
+                    *(self._fetch_remote_member_roles(gid, member.id, semaphore) for gid in remote),
+                    return_exceptions=True
+                )
+                local_results = iter(results[:len(results) - len(remote)])
+                remote_results = dict(zip(remote, results[len(results) - len(remote):]))
+
+                for (cfg_guild_id, cfg), (_, guild) in zip(config_items, guilds):
+                    server_name = cfg.get("name", str(cfg_guild_id))
+                    verified_role_ids = {int(r) for r in cfg.get("verified_roles", [])}
+
+                    if guild:
+                        target_member = next(local_results)
+                        role_ids = {r.id for r in target_member.roles} if isinstance(target_member, discord.Member) else None
+                    elif int(cfg_guild_id) in remote:
+                        target_member = role_ids = remote_results[int(cfg_guild_id)]
+                    else:
+                        not_in_server.append(f"{server_name} (bot not present)")
+                        continue
 
-            for cfg_guild_id, cfg in config.items():
-                server_name = cfg.get("name", str(cfg_guild_id))
-                verified_role_ids = {int(r) for r in cfg.get("verified_roles", [])}
+                    if isinstance(target_member, asyncio.TimeoutError):
+                        not_in_server.append(f"{server_name} (lookup timed out)")
+                    elif isinstance(target_member, discord.Forbidden):
+                        not_in_server.append(f"{server_name} (bot not present)")
+                    elif isinstance(target_member, Exception):
+                        not_in_server.append(f"{server_name} (lookup failed)")
+                    elif target_member is None:
+                        not_in_server.append(server_name)
+                    elif role_ids & verified_role_ids:
+                        verified_in.append(server_name)
+                    else:
+                        not_verified_in.append(server_name)
 
-                guild = self.bot.get_guild(int(cfg_guild_id))
-                if not guild:
-                    not_in_server.append(f"{server_name} (bot not present)")
+                if not verified_only or len(verified_in) > 1:
+                    rows.append((member, verified_in, not_verified_in, not_in_server))
+        else:
+            # Resolve the configured guilds once instead of once per member
+            guilds = [
+                (int(cfg_guild_id), cfg.get("name", str(cfg_guild_id)), self.bot.get_guild(int(cfg_guild_id)))
+                for cfg_guild_id, cfg in config.items()
+            ]
+            for member in members_to_check:
+                verified_ids = self.verification_index.verified_guilds(member.id)
+                if verified_only and len(verified_ids) <= 1:
                     continue
 
-                # Fetch single member if single-user mode, otherwise use cached get_member()
-                if user:
-                    try:
-                        target_member = await guild.fetch_member(member.id)
-                    except discord.NotFound:
-                        target_member = None
-                else:
-                    target_member = guild.get_member(member.id)
-                    if target_member is None:
+                verified_in = []
+                not_verified_in = []
+                not_in_server = []
+                for gid, server_name, guild in guilds:
+                    if gid in verified_ids:
+                        verified_in.append(server_name)
+                    elif not guild and not self._owns_guild(gid):
+                        not_in_server.append(f"{server_name} (served by another bot process)")
+                    elif not guild:
+                        not_in_server.append(f"{server_name} (bot not present)")
+                    elif guild.get_member(member.id) is None:
                         not_in_server.append(server_name)
-                        continue
+                    else:
+                        not_verified_in.append(server_name)
 
-                if target_member is None:
-                    not_in_server.append(server_name)
-                elif any(r.id in verified_role_ids for r in target_member.roles):
-                    verified_in.append(server_name)
-                else:
-                    not_verified_in.append(server_name)
-
-            # Build per-member line
-            line = f"{member.mention}: "
-            parts = []
-
-
-            if verified_in:
-                parts.append("✅ " + ", ".join(verified_in))
-            if not_verified_in:
-                parts.append("❌ " + ", ".join(not_verified_in))
-            if not_in_server:
-                parts.append("⚠️ " + ", ".join(not_in_server))
-            line += " | ".join(parts)
-            if not verified_only:
-                all_lines.append(line)
-            elif len(verified_in)>1:
-                all_lines.append(line)
-
-        # Batch the lines to respect Discord 2000-character limit
-
-        batch = ""
-        if len(all_lines)>0:
-            for line in all_lines:
-                # Reserve space for the header
-                if len(HEADER) + len(batch) + len(line) + 1 > MAX_MESSAGE_LENGTH:
-                    await interaction.followup.send(
-                        HEADER + batch,
-                        ephemeral=True
-                    )
-                    batch = line + "\n"
-                else:
-                    batch += line + "\n"
-        else:
-            batch += "No verified members found in more than 1 server"
+                rows.append((member, verified_in, not_verified_in, not_in_server))
 
-        # Send any remaining lines
-        if batch:
+        if not rows:
             await interaction.followup.send(
-                HEADER + batch,
+                HEADER + "No verified members found in more than 1 server",
                 ephemeral=True
             )
+        elif as_file:
+            await interaction.followup.send(
+                f"{HEADER}{len(rows)} member(s) in the attached file.",
+                file=self._verification_report_file(rows),
+                ephemeral=True
+            )
+        else:
+            # One message; further pages are rendered on demand from the same result
+            view = ReportPaginatorView(
+                invoker=interaction.user,
+                title="Verification report",
+                lines=[self._verification_line(*row) for row in rows]
+            )
+            await interaction.followup.send(embed=view.render(), view=view, ephemeral=True)
 
         print(f"Check_verify command used by {interaction.user.display_name} in {interaction.guild.name} server")
 
@@ -619,7 +1273,9 @@ class VCSlashCommands(commands.Cog):
             "log_channel": view.log_channel.id
         }
 
-        save_guild_config(str(interaction.guild.id), cfg)
+        await save_guild_config_async(str(interaction.guild.id), cfg)
+        await ensure_chunked(interaction.guild)
+        self.verification_index.index_guild(interaction.guild, cfg)
         print(f"Verification system configured for guild {interaction.guild.name} by {interaction.user.display_name}")
 
     @app_commands.command(
@@ -631,7 +1287,7 @@ class VCSlashCommands(commands.Cog):
                          interaction: discord.Interaction,
         ):
         guild_id = str(interaction.guild.id)
-        guild_cfg = load_guild_config(guild_id, interaction.guild.name)
+        guild_cfg = await load_guild_config_async(guild_id, interaction.guild.name)
 
         if not guild_cfg:
             await interaction.response.send_message(
@@ -643,7 +1299,8 @@ class VCSlashCommands(commands.Cog):
         view = VerifyUserView(
             invoker=interaction.user,
             guild=interaction.guild,
-            config=guild_cfg
+            config=guild_cfg,
+            audit_log=self.audit_log
         )
 
         await interaction.response.send_message(
@@ -673,7 +1330,7 @@ class VCSlashCommands(commands.Cog):
                          interaction: discord.Interaction,
         ):
         guild_id = str(interaction.guild.id)
-        guild_cfg = load_guild_config(guild_id, interaction.guild.name)
+        guild_cfg = await load_guild_config_async(guild_id, interaction.guild.name)
 
         if not guild_cfg:
             await interaction.response.send_message(
@@ -685,7 +1342,8 @@ class VCSlashCommands(commands.Cog):
         view = RemoveVerifyView(
             invoker=interaction.user,
             guild=interaction.guild,
-            config=guild_cfg
+            config=guild_cfg,
+            audit_log=self.audit_log
         )
 
         await interaction.response.send_message(
@@ -705,6 +1363,164 @@ class VCSlashCommands(commands.Cog):
                 users_text = ", ".join(getattr(u, "name", str(u)) for u in unverified_users)
             print(f"{interaction.user.display_name} has unverified: {users_text} in {interaction.guild.name}")
 
+    @app_commands.command(
+        name="bulk_verify",
+        description="Verify or unverify many users at once by role, pasted ids or a file of ids"
+    )
+    @app_commands.describe(
+        action="Verify or unverify the users",
+        role="Everyone with this role",
+        user_ids="User ids or mentions, separated by spaces, commas or new lines",
+        file="A text or CSV file containing user ids",
+        guest_role="Also remove (verify) or give back (unverify) the configured guest role"
+    )
+    @app_commands.choices(action=[
+        app_commands.Choice(name="verify", value="verify"),
+        app_commands.Choice(name="unverify", value="unverify"),
+    ])
+    @app_commands.default_permissions(manage_roles=True)
+    async def bulk_verify(self,
+                          interaction: discord.Interaction,
+                          action: app_commands.Choice[str],
+                          role: discord.Role = None,
+                          user_ids: str = None,
+                          file: discord.Attachment = None,
+                          guest_role: bool = True
+    ):
+        guild = interaction.guild
+        guild_cfg = await load_guild_config_async(str(guild.id), guild.name)
+
+        if not guild_cfg:
+            await interaction.response.send_message(
+                "❌ Verification system is not set up in this server.",
+                ephemeral=True
+            )
+            return
+
+        # Same allowed role check as the verify/unverify views
+        allowed_roles = set(guild_cfg.get("allowed_roles", []))
+        if not {r.id for r in interaction.user.roles}.intersection(allowed_roles):
+            await interaction.response.send_message(
+                "You are not allowed to use this command.",
+                ephemeral=True
+            )
+            return
+
+        if role is None and not user_ids and file is None:
+            await interaction.response.send_message(
+                "❌ Give a role, a list of user ids or a file of user ids.",
+                ephemeral=True
+            )
+            return
+
+        if file is not None and file.size > BULK_VERIFY_MAX_FILE_SIZE:
+            await interaction.response.send_message(
+                f"❌ The file is too large (max {BULK_VERIFY_MAX_FILE_SIZE // 1024} KB).",
+                ephemeral=True
+            )
+            return
+
+        await interaction.response.defer(ephemeral=True)
+
+        # Collect the targets: role members come straight from the cache,
+        # ids are resolved from the cache first and fetched concurrently otherwise
+        if role:
+            await ensure_chunked(guild)
+        members = {m.id: m for m in role.members} if role else {}
+        ids = parse_user_ids(user_ids or "")
+        if file is not None:
+            ids += parse_user_ids((await file.read()).decode("utf-8", errors="ignore"))
+
+        missing = []
+        for user_id in dict.fromkeys(ids):
+            member = guild.get_member(user_id)
+            if member:
+                members[user_id] = member
+            elif user_id not in members:
+                missing.append(user_id)
+
+        # Members about to be edited are fetched fresh, never from the lookup cache:
+        # the role edit is computed from them
+        semaphore = asyncio.Semaphore(MEMBER_FETCH_CONCURRENCY)
+        fetched = await asyncio.gather(
+            *(self._fetch_member(guild, user_id, semaphore) for user_id in missing),
+            return_exceptions=True
+        )
+        not_found = []
+        for user_id, member in zip(missing, fetched):
+            if isinstance(member, discord.Member):
+                members[user_id] = member
+            else:
+                not_found.append(user_id)
+
+        targets = [m for m in members.values() if not m.bot]
+        if not targets:
+            await interaction.followup.send("❌ None of the given users are in this server.", ephemeral=True)
+            return
+
+        top_role = guild.me.top_role
+        verified_roles = [
+            r for r in (guild.get_role(int(rid)) for rid in guild_cfg.get("verified_roles", []))
+            if r and r < top_role
+        ]
+        guest = guild.get_role(int(guild_cfg["guest_role"])) if guest_role and guild_cfg.get("guest_role") else None
+        guest = [guest] if guest and guest < top_role else []
+
+        verify = action.value == "verify"
+        result = await edit_member_roles(
+            targets,
+            add=verified_roles if verify else guest,
+            remove=guest if verify else verified_roles,
+            reason=f"Bulk {action.value} by {interaction.user}"
+        )
+        failed_ids = {member.id for member, _ in result.errors}
+        # Cached lookups of these members now show the old roles
+        for member in targets:
+            self._member_fetch_cache.pop((guild.id, member.id), None)
+
+        result_msg = f"✅ {action.value.capitalize()}: {result.succeeded} user(s) updated ({result.summary()})."
+        if result.failed:
+            result_msg += f"\n⚠️ Failed to update {result.failed} user(s) (permissions or API error)"
+        if not_found:
+            result_msg += f"\n⚠️ {len(not_found)} id(s) are not members of this server"
+        await interaction.followup.send(result_msg, ephemeral=True)
+
+        log_channel = guild.get_channel(guild_cfg.get("log_channel") or 0)
+        if log_channel:
+            updated = [m for m in targets if m.id not in failed_ids]
+            embed = discord.Embed(
+                title="Users Verified (bulk)" if verify else "Users Unverified (bulk)",
+                color=discord.Color.green() if verify else discord.Color.red()
+            )
+            embed.add_field(name="Moderator", value=interaction.user.mention, inline=False)
+
+            mentions = ", ".join(m.mention for m in updated[:BULK_VERIFY_LOG_MENTIONS])
+            if len(updated) > BULK_VERIFY_LOG_MENTIONS:
+                mentions += f" and {len(updated) - BULK_VERIFY_LOG_MENTIONS} more"
+            embed.add_field(name=f"Users ({len(updated)})", value=mentions or "None", inline=False)
+            embed.add_field(
+                name="Roles Assigned" if verify else "Roles Removed",
+                value=", ".join(r.mention for r in verified_roles) or "None",
+                inline=False
+            )
+            if result.failed or not_found:
+                embed.add_field(
+                    name="Skipped",
+                    value=f"{result.failed} failed, {len(not_found)} not in server",
+                    inline=False
+                )
+
+            # The full list goes along as a file so the embed stays within limits
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(["user_id", "user", "status"])
+            writer.writerows([m.id, str(m), "failed" if m.id in failed_ids else "ok"] for m in targets)
+            writer.writerows([user_id, "", "not in server"] for user_id in not_found)
+            data = io.BytesIO(buffer.getvalue().encode("utf-8"))
+            await self.audit_log.send(log_channel, embed, file=discord.File(data, filename=f"bulk_{action.value}.csv"))
+
+        print(f"{interaction.user.display_name} bulk {action.value} in {guild.name}: {result.summary()}, {len(not_found)} not found")
+
     # ------------------------------
     # Send Thread Messages Command
     # ------------------------------
@@ -718,7 +1534,8 @@ class VCSlashCommands(commands.Cog):
 
         view = ThreadMessageView(
             invoker=interaction.user,
-            guild=interaction.guild
+            guild=interaction.guild,
+            runner=self.thread_jobs
         )
 
         await interaction.response.send_message(
@@ -726,6 +1543,18 @@ class VCSlashCommands(commands.Cog):
             view=view,
             ephemeral=True
         )
+
+    @app_commands.command(
+        name="thread_jobs",
+        description="Show progress of /create_threads jobs in this server"
+    )
+    @app_commands.default_permissions(manage_threads=True)
+    async def thread_jobs_status(self, interaction: discord.Interaction):
+        jobs = self.thread_jobs.jobs(interaction.guild.id)
+        await interaction.response.send_message(
+            "\n".join(self.thread_jobs.describe(job) for job in jobs) if jobs else "No thread jobs since the bot started.",
+            ephemeral=True
+        )
     # ------------------------------
     # Raid Roles
     # ------------------------------
@@ -747,7 +1576,7 @@ class VCSlashCommands(commands.Cog):
         if not view.raid_lead_role or not view.raid_backup_role or not view.raid_scout_role:
             return
 
-        cfg = load_guild_config(str(interaction.guild.id), str(interaction.guild.name))
+        cfg = await load_guild_config_async(str(interaction.guild.id), str(interaction.guild.name))
         if cfg is None:
             await interaction.followup.send(
                 "❌ Server not configured. Please run /setup_verify first.",
@@ -755,6 +1584,8 @@ class VCSlashCommands(commands.Cog):
             )
             return
 
+        # cfg is the cached dict; change a copy so a failed save leaves the cache as stored
+        cfg = dict(cfg)
         cfg.update({
             "Raid Channel": view.raid_vc_channel.id,
             "Raid roles": {
@@ -764,40 +1595,50 @@ class VCSlashCommands(commands.Cog):
             }
         })
 
-        save_guild_config(str(interaction.guild.id), cfg)
+        await save_guild_config_async(str(interaction.guild.id), cfg)
         print(f"Raid roles configured for guild {interaction.guild.name} by {interaction.user.display_name}")
 
-    async def raid_moving_task(self,guild: discord.Guild, cfg : dict):
-        """Background task that monitors the raid."""
-        try:
-            while os.path.exists(os.path.join(get_config_dir(), f"{guild.id}_raid.json")):
-            # Your background task logic here
-            # Example: Monitor raid status, update roles, etc.
-                await asyncio.sleep(5)  # Check every 5 seconds
-                if os.path.exists(os.path.join(get_config_dir(), f"{guild.id}_raid.json")):
-                    membersToMove=[]
-                    moved_count=0
-                    failed_count=0
-                    for cid in cfg["channels"]:
-                        c=guild.get_channel(cid)
-                        for m in c.members:
-                            membersToMove.append(m)
-
-                    for member in membersToMove:
-                        try:
-                            await member.move_to(guild.get_channel(cfg["Raid Channel"]))
-                            moved_count += 1
-                        except discord.Forbidden:
-                            failed_count += 1
-                        except discord.HTTPException:
-                            failed_count += 1
-                else:
-                    print(f"raid in {guild.name} ended")
-
-
+    async def _pull_into_raid(self, guild: discord.Guild, raid: dict, members):
+        """Move `members` into the raid channel."""
+        destination = guild.get_channel(raid["Raid Channel"])
+        if destination is None:
+            print(f"Raid channel for {guild.name} no longer exists")
+            return None
+        # run_bulk may retry a move; time each pull from its first attempt
+        # and count a failure only once the retries are used up
+        started: dict[int, float] = {}
+
+        async def pull(member: discord.Member):
+            await self._pull_member(member, destination, started.setdefault(member.id, time.perf_counter()))
+
+        result = await run_bulk(members, pull, concurrency=MOVE_CONCURRENCY)
+        for member, _ in result.errors:
+            self.raids.record_pull(guild.id, time.perf_counter() - started[member.id], ok=False)
+        return result
+
+    async def _pull_member(self, member: discord.Member, destination: discord.VoiceChannel, started: float):
+        """Move `member` into the raid channel; failed pulls are recorded by the caller."""
+        await member.move_to(destination)
+        self.raids.record_pull(member.guild.id, time.perf_counter() - started, ok=True)
+
+    @commands.Cog.listener()
+    async def on_voice_state_update(self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState):
+        # Pull members into the raid as soon as they join one of its source channels
+        raid = self.raids.get(member.guild.id)
+        if raid is None or after.channel is None or before.channel == after.channel:
+            return
+        if after.channel.id not in raid["channels"]:
+            return
 
-        except Exception as e:
-            print(f"Raid background task error for guild {guild.id}: {e}")
+        destination = member.guild.get_channel(raid["Raid Channel"])
+        if destination is None:
+            return
+        started = time.perf_counter()
+        try:
+            await self._pull_member(member, destination, started)
+        except discord.HTTPException as e:
+            self.raids.record_pull(member.guild.id, time.perf_counter() - started, ok=False)
+            print(f"Failed to pull {member.display_name} into raid in {member.guild.name}: {e}")
 
     @app_commands.command(
         name="raid_start",
@@ -806,10 +1647,11 @@ class VCSlashCommands(commands.Cog):
     @app_commands.default_permissions(manage_guild=True)
     async def raid_start(self, interaction: discord.Interaction):
         try:
-            print(load_guild_config(str(interaction.guild.id), str(interaction.guild.name)).keys())
-            rcfg= {"Raid Channel" : load_guild_config(str(interaction.guild.id), str(interaction.guild.name))["Raid Channel"],
-                   "Raid roles" : load_guild_config(str(interaction.guild.id), str(interaction.guild.name))["Raid roles"]}
-            if not os.path.exists(os.path.join(get_config_dir(), f"{str(interaction.guild.id)}_raid.json")):
+            guild_cfg = await load_guild_config_async(str(interaction.guild.id), str(interaction.guild.name))
+            print(guild_cfg.keys())
+            rcfg= {"Raid Channel" : guild_cfg["Raid Channel"],
+                   "Raid roles" : guild_cfg["Raid roles"]}
+            if interaction.guild.id not in self.raids:
                 view = RaidStartView(
                     invoker=interaction.user,
                     guild=interaction.guild
@@ -840,13 +1682,15 @@ class VCSlashCommands(commands.Cog):
                 }
 
                 if cfg["leads"]:
-                    save_raid_config(str(interaction.guild.id), cfg)
                     cfg.update(rcfg)
-                    # Start background task to monitor the raid
-                    asyncio.create_task(self.raid_moving_task(interaction.guild,cfg))
+                    # From now on on_voice_state_update pulls in anyone joining a source channel;
+                    # sweep the people who are already there once.
+                    await self.raids.start(interaction.guild.id, cfg)
+                    waiting = [m for c in view.channels for m in getattr(interaction.guild.get_channel(c.id), "members", [])]
+                    await self._pull_into_raid(interaction.guild, cfg, waiting)
 
                     await interaction.followup.send(
-                        "✅ Raid started successfully! Background monitoring is now active.",
+                        "✅ Raid started successfully! Members joining the selected channels will be pulled in automatically.",
                         ephemeral=True
                     )
 
@@ -862,17 +1706,6 @@ class VCSlashCommands(commands.Cog):
             traceback.print_exc()
             print(f"Failed to start raid: {e}")
 
-    async def load_raid(self,guild_id: str)->dict|None:
-        path = os.path.join(get_config_dir(), f"{guild_id}_raid.json")
-        if os.path.exists(path):
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except Exception as e:
-                print(e)
-                return None
-        return None
-
     @app_commands.command(
         name="raid_stop",
         description="Stop the current raid that is happening in the server"
@@ -884,21 +1717,31 @@ class VCSlashCommands(commands.Cog):
     async def raid_stop(self, interaction: discord.Interaction,channel: discord.VoiceChannel=None):
         guild=interaction.guild
         guild_id = str(interaction.guild.id)
-        rcfg = {"Raid Channel": load_guild_config(guild_id, interaction.guild.name)["Raid Channel"],"Raid roles": load_guild_config(guild_id, interaction.guild.name)["Raid roles"]}
-        crcfg= await self.load_raid(guild_id)
+        guild_cfg = await load_guild_config_async(guild_id, interaction.guild.name)
+        rcfg = {"Raid Channel": guild_cfg["Raid Channel"],"Raid roles": guild_cfg["Raid roles"]}
         await interaction.response.defer(ephemeral=True)
+        crcfg = self.raids.get(guild.id)
 
         if crcfg is None:
             await interaction.followup.send("No raid currently running")
         else:
             try:
-                for m in crcfg["leads"]:
-                    await guild.get_member(m).remove_roles(interaction.guild.get_role(rcfg["Raid roles"]["Lead Role"]))
-                for m in crcfg["scouts"]:
-                    await guild.get_member(m).remove_roles(interaction.guild.get_role(rcfg["Raid roles"]["Scout Role"]))
-                for m in crcfg["back_up_lead"]:
-                    await guild.get_member(m).remove_roles(interaction.guild.get_role(rcfg["Raid roles"]["Back-Up Role"]))
-                os.remove(os.path.join(get_config_dir(), f"{guild_id}_raid.json"))
+                # Raid members may not be cached since guilds aren't chunked at startup
+                await ensure_chunked(guild)
+                for key, role_name in (("leads", "Lead Role"), ("scouts", "Scout Role"), ("back_up_lead", "Back-Up Role")):
+                    role = guild.get_role(rcfg["Raid roles"][role_name])
+                    for m in crcfg[key]:
+                        member = guild.get_member(m)
+                        if role is None or member is None:
+                            # Role deleted or member left the server
+                            continue
+                        try:
+                            await member.remove_roles(role)
+                        except discord.HTTPException as e:
+                            print(f"Failed to remove {role.name} from {member}: {e}")
+                # Only forget the raid once its roles are cleaned up
+                stats = self.raids.stats(guild.id)
+                await self.raids.stop(guild.id)
                 membersToMove = []
                 moved_count = 0
                 failed_count = 0
@@ -917,12 +1760,31 @@ class VCSlashCommands(commands.Cog):
                         failed_count += 1
                     except discord.HTTPException:
                         failed_count += 1
-                await interaction.followup.send("Raid Stopped")
+                await interaction.followup.send("Raid Stopped" + (f"\n{stats.summary()}" if stats else ""))
             except Exception as e:
                 await  interaction.followup.send("Failed To Stop")
                 import traceback
                 traceback.print_exc()
                 print(e)
+
+    @app_commands.command(
+        name="raid_status",
+        description="Show stats for the raid that is running in the server"
+    )
+    @app_commands.default_permissions(manage_guild=True)
+    async def raid_status(self, interaction: discord.Interaction):
+        raid = self.raids.get(interaction.guild.id)
+        stats = self.raids.stats(interaction.guild.id)
+        if raid is None or stats is None:
+            await interaction.response.send_message("No raid currently running", ephemeral=True)
+            return
+
+        channels = ", ".join(f"<#{cid}>" for cid in raid["channels"])
+        await interaction.response.send_message(
+            f"Raid running into <#{raid['Raid Channel']}> from {channels}\n{stats.summary()}",
+            ephemeral=True
+        )
+
     # ------------------------------
     # Help Commands
     # ------------------------------
@@ -938,6 +1800,7 @@ class VCSlashCommands(commands.Cog):
             "/setup_verify - Configure the verification system for this server (set verified roles, guest role, log channel)\n"
             "/verify_user - Assign the verified role to users through an interactive UI\n"
             "/remove_verify - Remove the verified role from users through an interactive UI\n"
+            "/bulk_verify - Verify or unverify everyone with a role, a pasted id list or a file of ids\n"
             "/check_verified - Check which servers a user is verified in\n"
             "Note: You must run /setup_verify before using the other verification commands.",
             ephemeral=True
@@ -954,6 +1817,7 @@ class VCSlashCommands(commands.Cog):
             "/setup_raid - Configure the raid roles and channel for this server\n"
             "/raid_start - Start a raid by selecting channels to pull users from and assigning them roles\n"
             "/raid_stop - Stop the current raid and optionally move users back to a specified channel\n"
+            "/raid_status - Show how many members the current raid has pulled in\n"
             "Note: You must run /setup_raid before using the other raid commands.",
             ephemeral=True
         )
\ No newline at end of file
@@ -0,0 +1,28 @@
+import os
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from metrics import Histogram
+
+
+STORAGE_WORKERS = int(os.environ.get("STORAGE_WORKERS", "2"))
+
+FILE_IO_TIME = Histogram("file_io_seconds", "Time spent in file-backed config/raid I/O")
+
+# Dedicated pool for blocking file I/O so a slow disk can't starve the default
+# executor or hold up interaction acknowledgements on the event loop.
+_executor = ThreadPoolExecutor(max_workers=STORAGE_WORKERS, thread_name_prefix="storage")
+
+
+async def run_io(fn, *args, op: str | None = None):
+    """Run a blocking storage function on the storage pool and await it."""
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    try:
+        return await loop.run_in_executor(_executor, fn, *args)
+    finally:
+        FILE_IO_TIME.observe(time.perf_counter() - start, op=op or fn.__name__)
+
+
+def shutdown():
+    _executor.shutdown(wait=True)
@@ -0,0 +1,207 @@
+import os
+import copy
+import time
+import uuid
+import asyncio
+import discord
+from bulk import run_bulk
+
+
+THREAD_JOB_CONCURRENCY = int(os.environ.get("THREAD_JOB_CONCURRENCY", "3"))
+# A job's progress is saved after this many member updates or this many
+# seconds since its last save, whichever comes first, and when it finishes
+THREAD_JOB_SAVE_EVERY = int(os.environ.get("THREAD_JOB_SAVE_EVERY", "25"))
+THREAD_JOB_SAVE_INTERVAL = float(os.environ.get("THREAD_JOB_SAVE_INTERVAL", "5"))
+
+
+class ThreadJobRunner:
+    """Background jobs that open a private thread and send a message per member.
+
+    A job's per-member cursor (thread created / member added / message sent)
+    is persisted as it advances, so a job interrupted by a restart resumes
+    where it stopped instead of opening the same threads again. New threads
+    are saved right away; the other updates are batched
+    (THREAD_JOB_SAVE_EVERY / THREAD_JOB_SAVE_INTERVAL) and written out by
+    close(), so only a crash can repeat the last unsaved batch of messages.
+    `load_all` and `save` are the async storage callables to use; jobs are
+    stored per guild as {job id: job}.
+    """
+
+    def __init__(self, bot, load_all, save):
+        self.bot = bot
+        self._load_all = load_all
+        self._save = save
+        # guild id -> job id -> job
+        self._jobs: dict[int, dict[str, dict]] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._save_locks: dict[int, asyncio.Lock] = {}
+        self._dirty: set[int] = set()
+        # guild id -> job id -> copy of each unfinished job as last saved;
+        # a save only re-copies the job that changed
+        self._snapshots: dict[int, dict[str, dict]] = {}
+        # job id -> member updates since its last save, and when that was
+        self._unsaved: dict[str, int] = {}
+        self._last_saved: dict[str, float] = {}
+
+    def jobs(self, guild_id: int) -> list[dict]:
+        return list(self._jobs.get(guild_id, {}).values())
+
+    @staticmethod
+    def counts(job: dict) -> tuple[int, int, int]:
+        """Return (done, failed, total) for a job."""
+        states = [m["status"] for m in job["members"].values()]
+        return states.count("done"), states.count("failed"), len(states)
+
+    def describe(self, job: dict) -> str:
+        done, failed, total = self.counts(job)
+        state = "failed" if job.get("error") else "finished" if job.get("finished") else "running"
+        elapsed = time.time() - job["started_at"]
+        return (
+            f"Job `{job['id']}` ({state}): {done}/{total} thread(s) created, "
+            f"{failed} failed, {elapsed:.0f}s elapsed"
+        )
+
+    async def start(self, guild: discord.Guild, channel, members, greeting: str, message: str,
+                    mention_roles, invoker) -> dict:
+        job = {
+            "id": uuid.uuid4().hex[:8],
+            "guild_id": guild.id,
+            "channel_id": channel.id,
+            "invoker_id": invoker.id,
+            "greeting": greeting,
+            "message": message,
+            "mention_role_ids": [r.id for r in mention_roles],
+            "started_at": time.time(),
+            "members": {
+                str(m.id): {"status": "pending", "thread_id": None, "added": False}
+                for m in members
+            },
+        }
+        self._jobs.setdefault(guild.id, {})[job["id"]] = job
+        await self._persist(job, force=True)
+        self._spawn(job)
+        return job
+
+    async def resume(self, owns=None) -> int:
+        """Restart every unfinished persisted job. Returns how many were resumed.
+
+        `owns(guild_id)` limits this to the guilds served by this process.
+        """
+        resumed = 0
+        for gid, jobs in (await self._load_all()).items():
+            if owns is not None and not owns(int(gid)):
+                continue
+            for job_id, job in jobs.items():
+                if job.get("finished") or job_id in self._tasks:
+                    continue
+                # What was loaded is what is saved; run on a copy of it
+                self._snapshots.setdefault(int(gid), {})[job_id] = job
+                job = copy.deepcopy(job)
+                self._jobs.setdefault(int(gid), {})[job_id] = job
+                self._spawn(job)
+                resumed += 1
+        return resumed
+
+    async def close(self):
+        """Stop the running jobs and save their progress so they resume cleanly."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for jobs in self._jobs.values():
+            for job in jobs.values():
+                if not job.get("finished"):
+                    await self._persist(job, force=True)
+
+    def _spawn(self, job: dict):
+        task = asyncio.create_task(self._run(job))
+        self._tasks[job["id"]] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job["id"], None))
+
+    async def _persist(self, job: dict, force: bool = False):
+        """Save `job`'s progress. Member updates are batched unless `force` is set."""
+        job_id, guild_id = job["id"], job["guild_id"]
+        if not force:
+            unsaved = self._unsaved.get(job_id, 0) + 1
+            since_save = time.monotonic() - self._last_saved.get(job_id, 0.0)
+            if unsaved < THREAD_JOB_SAVE_EVERY and since_save < THREAD_JOB_SAVE_INTERVAL:
+                self._unsaved[job_id] = unsaved
+                return
+
+        snapshots = self._snapshots.setdefault(guild_id, {})
+        if job.get("finished"):
+            snapshots.pop(job_id, None)
+            self._unsaved.pop(job_id, None)
+            self._last_saved.pop(job_id, None)
+        else:
+            snapshots[job_id] = copy.deepcopy(job)
+            self._unsaved[job_id] = 0
+            self._last_saved[job_id] = time.monotonic()
+
+        # Saves are serialised per guild and coalesced: whoever gets the lock
+        # writes the latest snapshots, later waiters skip if nothing changed since.
+        self._dirty.add(guild_id)
+        async with self._save_locks.setdefault(guild_id, asyncio.Lock()):
+            if guild_id not in self._dirty:
+                return
+            self._dirty.discard(guild_id)
+            await self._save(str(guild_id), dict(snapshots))
+
+    async def _run(self, job: dict):
+        guild = self.bot.get_guild(job["guild_id"])
+        channel = guild.get_channel(job["channel_id"]) if guild else None
+        if channel is None:
+            print(f"Thread job {job['id']}: guild or channel no longer available")
+            # Mark it done with so it isn't resumed on every restart
+            job["finished"] = True
+            job["error"] = "guild or channel no longer available"
+            await self._persist(job, force=True)
+            return
+
+        pending = [mid for mid, state in job["members"].items() if state["status"] == "pending"]
+        result = await run_bulk(
+            pending,
+            lambda mid: self._deliver(guild, channel, job, mid),
+            concurrency=THREAD_JOB_CONCURRENCY
+        )
+        for mid, error in result.errors:
+            job["members"][mid]["status"] = "failed"
+            print(f"Thread job {job['id']}: failed for member {mid}: {error}")
+
+        job["finished"] = True
+        await self._persist(job, force=True)
+        print(f"{self.describe(job)} in {guild.name}")
+
+    async def _deliver(self, guild: discord.Guild, channel, job: dict, member_id: str):
+        state = job["members"][member_id]
+        member = guild.get_member(int(member_id)) or await guild.fetch_member(int(member_id))
+
+        thread = None
+        if state["thread_id"]:
+            thread = guild.get_thread(state["thread_id"])
+            if thread is None:
+                try:
+                    thread = await guild.fetch_channel(state["thread_id"])
+                except discord.NotFound:
+                    thread = None
+        if thread is None:
+            thread = await channel.create_thread(
+                name=f"Message for {member.display_name}",
+                type=discord.ChannelType.private_thread,
+                invitable=False
+            )
+            state["thread_id"] = thread.id
+            # Record the thread before anything else so a restart won't open it twice
+            await self._persist(job, force=True)
+
+        if not state["added"]:
+            await thread.add_user(member)
+            state["added"] = True
+
+        message_content = f"{job['greeting']} {member.mention}\n{job['message']}\n"
+        for role_id in job["mention_role_ids"]:
+            message_content += f"<@&{role_id}>\n"
+        await thread.send(message_content)
+
+        state["status"] = "done"
+        await self._persist(job)
@@ -1,4 +1,15 @@
+import time
+import asyncio
 import discord
+from verification import edit_member_roles
+from gateway import ensure_chunked
+
+
+# Embed descriptions are capped at 4096 characters
+EMBED_PAGE_LENGTH = 4000
+
+# Fire-and-forget tasks started by views; the loop only keeps weak references
+_background_tasks: set[asyncio.Task] = set()
 
 
 class ThreadMessageModal(discord.ui.Modal, title="Thread Message Configuration"):
@@ -190,8 +201,10 @@ class SetupVerifyView(discord.ui.View):
 
 
 class VerifyUserView(discord.ui.View):
-    def __init__(self, invoker, guild, config: dict):
+    def __init__(self, invoker, guild, config: dict, audit_log=None):
         super().__init__(timeout=300)
+        # AuditLogSink that batches log embeds; sent directly when None
+        self.audit_log = audit_log
 
         self.invoker = invoker
         self.guild = guild
@@ -207,6 +220,9 @@ class VerifyUserView(discord.ui.View):
         self.guest_role_id = config.get("guest_role")
         self.log_channel_id = config.get("log_channel")
 
+        # Roles the bot can hand out or take away sit below its top role
+        self.bot_top_role = guild.me.top_role
+
         self.User_select = discord.ui.UserSelect(
             placeholder="Select users to verify",
             min_values=1,
@@ -229,6 +245,15 @@ class VerifyUserView(discord.ui.View):
         self.guest_select.callback = self.on_guest_select
         self.add_item(self.guest_select)
 
+    def _can_manage(self, role: discord.Role | None) -> bool:
+        return role is not None and role < self.bot_top_role
+
+    async def _send_log(self, embed: discord.Embed):
+        if self.audit_log is not None:
+            await self.audit_log.send(self.log_channel, embed)
+        else:
+            await self.log_channel.send(embed=embed)
+
     @property
     def log_channel(self) -> discord.TextChannel | None:
         if not self.log_channel_id:
@@ -276,24 +301,22 @@ class VerifyUserView(discord.ui.View):
                 ephemeral=True
             )
 
-        bot_member = self.guild.me
-        guest_role = self.guild.get_role(self.guest_role_id)
-
-        added = 0
-        for member in self.selected_users:
-            if self.remove_guest_role and guest_role and guest_role in member.roles:
-                await member.remove_roles(guest_role)
-
-            for role in self.verified_roles:
-                if role < bot_member.top_role and role not in member.roles:
-                    await member.add_roles(role)
-                    added += 1
+        await interaction.response.defer(ephemeral=True)
 
-        await interaction.response.send_message(
-            f"✅ Assigned roles to {len(self.selected_users)} user(s).",
-            ephemeral=True
+        # One member edit per user with the final role set, several users at a time
+        roles_to_add = [r for r in self.verified_roles if self._can_manage(r)]
+        guest_role = self.guild.get_role(self.guest_role_id)
+        roles_to_remove = [guest_role] if self.remove_guest_role and self._can_manage(guest_role) else []
+        result = await edit_member_roles(
+            self.selected_users, roles_to_add, roles_to_remove,
+            reason=f"Verified by {interaction.user}"
         )
 
+        result_msg = f"✅ Assigned roles to {result.succeeded} user(s)."
+        if result.failed:
+            result_msg += f"\n⚠️ Failed to update {result.failed} user(s) (permissions or API error)"
+        await interaction.followup.send(result_msg, ephemeral=True)
+
         log_channel = self.guild.get_channel(self.log_channel_id)
         if log_channel:
             embed = discord.Embed(
@@ -320,7 +343,7 @@ class VerifyUserView(discord.ui.View):
             )
 
             if self.log_channel:
-                await self.log_channel.send(embed=embed)
+                await self._send_log(embed)
 
         self.stop()
 
@@ -335,8 +358,10 @@ class VerifyUserView(discord.ui.View):
 
 
 class RemoveVerifyView(discord.ui.View):
-    def __init__(self, invoker, guild, config: dict):
+    def __init__(self, invoker, guild, config: dict, audit_log=None):
         super().__init__(timeout=300)
+        # AuditLogSink that batches log embeds; sent directly when None
+        self.audit_log = audit_log
 
         self.invoker = invoker
         self.guild = guild
@@ -352,6 +377,9 @@ class RemoveVerifyView(discord.ui.View):
         self.guest_role_id = config.get("guest_role")
         self.log_channel_id = config.get("log_channel")
 
+        # Roles the bot can hand out or take away sit below its top role
+        self.bot_top_role = guild.me.top_role
+
         self.User_select = discord.ui.UserSelect(
             placeholder="Select users to unverify",
             min_values=1,
@@ -376,6 +404,15 @@ class RemoveVerifyView(discord.ui.View):
         self.guest_select.callback = self.on_guest_select
         self.add_item(self.guest_select)
 
+    def _can_manage(self, role: discord.Role | None) -> bool:
+        return role is not None and role < self.bot_top_role
+
+    async def _send_log(self, embed: discord.Embed):
+        if self.audit_log is not None:
+            await self.audit_log.send(self.log_channel, embed)
+        else:
+            await self.log_channel.send(embed=embed)
+
     @property
     def log_channel(self) -> discord.TextChannel | None:
         if not self.log_channel_id:
@@ -423,24 +460,22 @@ class RemoveVerifyView(discord.ui.View):
                 ephemeral=True
             )
 
-        bot_member = self.guild.me
-        guest_role = self.guild.get_role(self.guest_role_id)
-
-        added = 0
-        for member in self.selected_users:
-            if self.add_guest_role and guest_role and guest_role not in member.roles:
-                await member.add_roles(guest_role)
-
-            for role in self.verified_roles:
-                if role < bot_member.top_role and role in member.roles:
-                    await member.remove_roles(role)
-                    added += 1
+        await interaction.response.defer(ephemeral=True)
 
-        await interaction.response.send_message(
-            f"✅ Removed roles off {len(self.selected_users)} user(s).",
-            ephemeral=True
+        # One member edit per user with the final role set, several users at a time
+        roles_to_remove = [r for r in self.verified_roles if self._can_manage(r)]
+        guest_role = self.guild.get_role(self.guest_role_id)
+        roles_to_add = [guest_role] if self.add_guest_role and self._can_manage(guest_role) else []
+        result = await edit_member_roles(
+            self.selected_users, roles_to_add, roles_to_remove,
+            reason=f"Unverified by {interaction.user}"
         )
 
+        result_msg = f"✅ Removed roles off {result.succeeded} user(s)."
+        if result.failed:
+            result_msg += f"\n⚠️ Failed to update {result.failed} user(s) (permissions or API error)"
+        await interaction.followup.send(result_msg, ephemeral=True)
+
         log_channel = self.guild.get_channel(self.log_channel_id)
         if log_channel:
             embed = discord.Embed(
@@ -467,7 +502,7 @@ class RemoveVerifyView(discord.ui.View):
             )
 
             if self.log_channel:
-                await self.log_channel.send(embed=embed)
+                await self._send_log(embed)
 
         self.stop()
 
@@ -482,11 +517,12 @@ class RemoveVerifyView(discord.ui.View):
 
 
 class ThreadMessageView(discord.ui.View):
-    def __init__(self, invoker, guild):
+    def __init__(self, invoker, guild, runner):
         super().__init__(timeout=300)
 
         self.invoker = invoker
         self.guild = guild
+        self.runner = runner  # ThreadJobRunner that does the actual work
 
         self.x_roles = []  # Roles whose members will receive threads
         self.channel = None  # Channel where threads will be created
@@ -573,6 +609,7 @@ class ThreadMessageView(discord.ui.View):
         await interaction.response.defer(ephemeral=True)
 
         # Get all unique members from X roles
+        await ensure_chunked(self.guild)
         members_set = set()
         for role in self.x_roles:
             members_set.update(role.members)
@@ -586,45 +623,40 @@ class ThreadMessageView(discord.ui.View):
                 ephemeral=True
             )
 
-        # Create threads and send messages
-        created_count = 0
-        failed_count = 0
-
-        for member in members:
-            try:
-                # Create private thread
-                thread = await self.channel.create_thread(
-                    name=f"Message for {member.display_name}",
-                    type=discord.ChannelType.private_thread,
-                    invitable=False
-                )
-
-                # Add the member to the thread
-                await thread.add_user(member)
-
-                # Build message content
-                message_content = f"{self.greeting} {member.mention}\n{self.message}\n"
-                for role in self.y_roles:
-                    message_content += f"{role.mention}\n"
-
-                # Send the message
-                await thread.send(message_content)
-
-                created_count += 1
-
-            except discord.Forbidden:
-                failed_count += 1
-            except discord.HTTPException as e:
-                print(f"Failed to create thread for {member.display_name}: {e}")
-                failed_count += 1
-
-        # Send completion message
-        result_msg = f"✅ Created {created_count} thread(s) for {len(members)} member(s)"
-        if failed_count > 0:
-            result_msg += f"\n⚠️ Failed to create {failed_count} thread(s) (permissions or API error)"
-
-        await interaction.followup.send(result_msg, ephemeral=True)
+        # Threads are created by a background job so large roles don't outlive
+        # the interaction token and a restart can pick up where it stopped
+        job = await self.runner.start(
+            self.guild, self.channel, members, self.greeting, self.message, self.y_roles, self.invoker
+        )
+        status = await interaction.followup.send(
+            f"⏳ Creating threads for {len(members)} member(s) in the background. "
+            f"Use /thread_jobs to check on job `{job['id']}`.",
+            ephemeral=True,
+            wait=True
+        )
         self.stop()
+        task = asyncio.create_task(self._report_progress(status, job))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    async def _report_progress(self, status: discord.WebhookMessage, job: dict):
+        # The followup can only be edited while the interaction token is valid (15 min)
+        deadline = time.monotonic() + 14 * 60
+        while time.monotonic() < deadline:
+            await asyncio.sleep(5)
+            done, failed, total = self.runner.counts(job)
+            if job.get("finished"):
+                result_msg = f"✅ Created {done} thread(s) for {total} member(s)"
+                if failed > 0:
+                    result_msg += f"\n⚠️ Failed to create {failed} thread(s) (permissions or API error)"
+            else:
+                result_msg = f"⏳ {self.runner.describe(job)}"
+            try:
+                await status.edit(content=result_msg)
+            except discord.HTTPException:
+                return
+            if job.get("finished"):
+                return
 
     @discord.ui.button(label="Cancel", style=discord.ButtonStyle.red, row=4)
     async def cancel(self, interaction, button):
@@ -820,3 +852,67 @@ class RaidStartView(discord.ui.View):
             ephemeral=True
         )
 
+
+class ReportPaginatorView(discord.ui.View):
+    """Shows a long list of report lines as embed pages with prev/next buttons.
+
+    Page boundaries are computed once up front; a page's embed is only built
+    when it is shown.
+    """
+
+    def __init__(self, invoker, title: str, lines: list[str], page_length: int = EMBED_PAGE_LENGTH):
+        super().__init__(timeout=600)
+
+        self.invoker = invoker
+        self.title = title
+        self.lines = [line[:page_length] for line in lines]
+        self.page = 0
+
+        # Index of the first line of every page
+        self.page_starts = [0]
+        size = 0
+        for i, line in enumerate(self.lines):
+            if size and size + len(line) + 1 > page_length:
+                self.page_starts.append(i)
+                size = 0
+            size += len(line) + 1
+
+        self._update_buttons()
+
+    @property
+    def page_count(self) -> int:
+        return len(self.page_starts)
+
+    def render(self) -> discord.Embed:
+        start = self.page_starts[self.page]
+        end = self.page_starts[self.page + 1] if self.page + 1 < self.page_count else len(self.lines)
+        embed = discord.Embed(
+            title=self.title,
+            description="\n".join(self.lines[start:end]),
+            color=discord.Color.blurple()
+        )
+        embed.set_footer(text=f"Page {self.page + 1}/{self.page_count} · {len(self.lines)} line(s)")
+        return embed
+
+    def _update_buttons(self):
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.page >= self.page_count - 1
+
+    async def _show(self, interaction, page: int):
+        if interaction.user.id != self.invoker.id:
+            return await interaction.response.send_message(
+                "This report is not for you.",
+                ephemeral=True
+            )
+
+        self.page = max(0, min(page, self.page_count - 1))
+        self._update_buttons()
+        await interaction.response.edit_message(embed=self.render(), view=self)
+
+    @discord.ui.button(label="◀ Previous", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction, button):
+        await self._show(interaction, self.page - 1)
+
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction, button):
+        await self._show(interaction, self.page + 1)
@@ -0,0 +1,119 @@
+import os
+import re
+import discord
+from bulk import run_bulk, BulkResult, BULK_CONCURRENCY
+
+
+ROLE_EDIT_CONCURRENCY = int(os.environ.get("ROLE_EDIT_CONCURRENCY", str(BULK_CONCURRENCY)))
+
+# Discord snowflakes, bare or inside a <@...> / <@!...> mention
+USER_ID_PATTERN = re.compile(r"\b\d{15,20}\b")
+
+
+class VerificationIndex:
+    """In-memory index of user id -> ids of the guilds where the user is verified.
+
+    Built once when the bot is ready and kept current from member events and
+    config saves, so cross-guild verification reports don't have to rescan
+    every member's roles.
+    """
+
+    def __init__(self):
+        self._verified: dict[int, set[int]] = {}
+        # guild id -> verified role ids taken from that guild's config
+        self._role_ids: dict[int, set[int]] = {}
+        # guilds whose member list has been scanned
+        self._indexed: set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._verified)
+
+    def verified_guilds(self, user_id: int) -> frozenset[int]:
+        """Snapshot of the guilds `user_id` is verified in; later index updates don't touch it."""
+        return frozenset(self._verified.get(user_id, ()))
+
+    def is_verified(self, user_id: int, guild_id: int) -> bool:
+        return guild_id in self._verified.get(user_id, ())
+
+    def is_indexed(self, guild_id: int) -> bool:
+        return guild_id in self._indexed
+
+    def rebuild(self, bot, configs: dict):
+        """Rebuild the whole index from the bot's member cache.
+
+        Guilds that haven't been chunked yet are skipped; index them with
+        index_guild() once their members are cached.
+        """
+        self._verified.clear()
+        self._role_ids.clear()
+        self._indexed.clear()
+        for gid, cfg in configs.items():
+            guild = bot.get_guild(int(gid))
+            if guild is not None and guild.chunked:
+                self.index_guild(guild, cfg)
+
+    def index_guild(self, guild: discord.Guild, cfg: dict | None):
+        """(Re)index a single guild, e.g. after its config was saved."""
+        self.drop_guild(guild.id)
+        self._indexed.add(guild.id)
+        role_ids = {int(r) for r in (cfg or {}).get("verified_roles", [])}
+        if not role_ids:
+            return
+        self._role_ids[guild.id] = role_ids
+        for member in guild.members:
+            if any(r.id in role_ids for r in member.roles):
+                self._verified.setdefault(member.id, set()).add(guild.id)
+
+    def drop_guild(self, guild_id: int):
+        self._role_ids.pop(guild_id, None)
+        self._indexed.discard(guild_id)
+        for user_id in [u for u, guilds in self._verified.items() if guild_id in guilds]:
+            self.remove_member(guild_id, user_id)
+
+    def update_member(self, member: discord.Member):
+        role_ids = self._role_ids.get(member.guild.id)
+        if not role_ids:
+            return
+        if any(r.id in role_ids for r in member.roles):
+            self._verified.setdefault(member.id, set()).add(member.guild.id)
+        else:
+            self.remove_member(member.guild.id, member.id)
+
+    def remove_member(self, guild_id: int, user_id: int):
+        guilds = self._verified.get(user_id)
+        if guilds is None:
+            return
+        guilds.discard(guild_id)
+        if not guilds:
+            del self._verified[user_id]
+
+
+def final_roles(member: discord.Member, add, remove) -> list[discord.Role] | None:
+    """Return the member's role list after the change, or None if nothing changes."""
+    current = [r for r in member.roles if not r.is_default()]
+    roles = [r for r in current if r not in remove]
+    roles += [r for r in add if r not in roles]
+    if set(roles) == set(current):
+        return None
+    return roles
+
+
+async def edit_member_roles(members, add, remove, reason: str | None = None,
+                            concurrency: int = ROLE_EDIT_CONCURRENCY) -> BulkResult:
+    """Apply role changes with one member edit per member, several members at a time."""
+
+    async def edit(member):
+        # The member passed in may be an older snapshot (e.g. from the fetch
+        # cache); work from the live cached roles so the full-list edit doesn't
+        # revert role changes made since
+        member = member.guild.get_member(member.id) or member
+        roles = final_roles(member, add, remove)
+        if roles is not None:
+            await member.edit(roles=roles, reason=reason)
+
+    return await run_bulk(members, edit, concurrency=concurrency)
+
+
+def parse_user_ids(text: str) -> list[int]:
+    """Pull the unique user ids out of pasted text or a file, keeping their order."""
+    return list(dict.fromkeys(int(m) for m in USER_ID_PATTERN.findall(text)))